@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Columns that decide what a user may do; read from the database (cached)
+# rather than trusted from the token, so they can be revoked.
+STATE_FIELDS = ("role", "is_active", "is_staff", "is_superuser")
+
+
+# ---------------------------------------------------------------------
+# USER STATE CACHE
+# ---------------------------------------------------------------------
+def _state_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def user_state(user_id):
+    """
+    {role, is_active, is_staff, is_superuser} for a user id, or False when
+    the user no longer exists. Cached for AUTH_USER_CACHE_TIMEOUT seconds
+    so a client making many requests costs one small query per window.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(*STATE_FIELDS).first() or False
+        cache.set(key, state, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 30))
+    return state
+
+
+def forget_user_state(user_id):
+    """
+    Drop a user's cached state after commit. With the default local-memory
+    cache other processes pick the change up within AUTH_USER_CACHE_TIMEOUT.
+    """
+    transaction.on_commit(lambda: cache.delete(_state_key(user_id)))
+
+
+# ---------------------------------------------------------------------
+# AUTHENTICATION
+# ---------------------------------------------------------------------
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the verified token
+    instead of loading the User row on every request.
+
+    The id and username come from the token claims (see
+    MyTokenObtainPairSerializer.get_token). Role and active/staff flags
+    come from the cached user state, so deactivating a user or changing
+    their role applies within AUTH_USER_CACHE_TIMEOUT, even to access
+    tokens issued before the change.
+
+    The result is a real User instance (it can be assigned to foreign
+    keys); every other field is deferred and loads on first access.
+    """
+
+    def get_user(self, validated_token):
+        if "username" not in validated_token:
+            # Issued without our claims; fall back to loading the row
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        state = user_state(user_id)
+        if state is False:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        values = {"id": User._meta.pk.to_python(user_id), "username": validated_token["username"], **state}
+        # from_db expects the loaded fields in model field order
+        names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+        return User.from_db(router.db_for_read(User), names, [values[name] for name in names])
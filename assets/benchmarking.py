@@ -0,0 +1,71 @@
+"""Helpers for driving the API in-process from management commands:
+authenticated clients, timed requests with their SQL, latency summaries."""
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .serializers import MyTokenObtainPairSerializer
+
+
+def api_host():
+    """A Host header ALLOWED_HOSTS accepts (the test client's "testserver" may not be)."""
+    hosts = [h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")]
+    return hosts[0] if hosts else "localhost"
+
+
+def api_client(user):
+    """A test client sending a fresh access token for `user` with every request."""
+    return Client(HTTP_HOST=api_host(), HTTP_AUTHORIZATION=f"Bearer {authorization_token(user)}")
+
+
+def authorization_token(user):
+    # Same claims as /api/token/; minted per client because access tokens are short-lived
+    return str(MyTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def timed_request(client, method, path, data=None, **extra):
+    """
+    Send one request and return (response, milliseconds, [sql, ...]).
+    Bytes are sent as the body as-is (with the content_type in `extra`).
+    """
+    if isinstance(data, bytes):
+        send = functools.partial(client.generic, method)
+    else:
+        send = getattr(client, method.lower())
+    kwargs = {} if data is None else {"data": data}
+    # Inside a caller's transaction, on_commit work (deferred touches and
+    # reindexing) would never run: run it here so it is timed and counted
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            response = send(path, **kwargs, **extra)
+        elapsed = (time.perf_counter() - start) * 1000
+    return response, elapsed, [q["sql"] for q in ctx.captured_queries]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+def latency_summary(timings):
+    return {
+        "p50": round(percentile(timings, 50), 2),
+        "p90": round(percentile(timings, 90), 2),
+        "p95": round(percentile(timings, 95), 2),
+        "p99": round(percentile(timings, 99), 2),
+        "max": round(max(timings), 2),
+        "mean": round(sum(timings) / len(timings), 2),
+    }
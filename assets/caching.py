@@ -0,0 +1,143 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Asset
+from .search import reindex_assets
+
+KEY_PREFIX = "assets:repr"
+GLOBAL_GENERATION = f"{KEY_PREFIX}:gen"
+HITS = f"{KEY_PREFIX}:hits"
+MISSES = f"{KEY_PREFIX}:misses"
+
+
+def asset_cache():
+    """The cache holding serialized assets (ASSET_CACHE_ALIAS in CACHES)."""
+    return caches[getattr(settings, "ASSET_CACHE_ALIAS", "default")]
+
+
+# ---------------------------------------------------------------------
+# INVALIDATION
+# ---------------------------------------------------------------------
+# Keys carry the asset's version, current_version and updated_at, read
+# from the database, so an edited asset gets a new key in every process.
+# Tags, categories and users appear inside many assets; changing one moves
+# updated_at on each asset that shows it (assets.signals), and also
+# replaces a global generation marker that drops this process's entries
+# at once. A marker missing from the cache (never set, or evicted) is
+# recreated with a fresh value rather than read as a default, so an
+# eviction can never revive an old key.
+def shared_generation(cache=None):
+    """Current global generation marker (bumped by invalidate_all_assets)."""
+    cache = cache or asset_cache()
+    value = cache.get(GLOBAL_GENERATION)
+    if value is None:
+        cache.add(GLOBAL_GENERATION, time.time_ns(), None)
+        value = cache.get(GLOBAL_GENERATION)
+    return value
+
+
+def touch_assets(*pks):
+    """Bump updated_at, after commit, for assets whose related rows (versions...) changed."""
+    _schedule_refresh(pks, reindex=False)
+
+
+def reindex_on_commit(*pks):
+    """Recompute the stored search text of assets after commit (this bumps updated_at too)."""
+    _schedule_refresh(pks, reindex=True)
+
+
+# One asset write fires several signals (post_save, m2m post_remove and
+# post_add, its new version's save and tags...), each asking for the asset
+# to be touched or reindexed. Requests are collected per connection and
+# applied after commit, once per asset: reindexed assets get updated_at
+# from reindex_assets, the others one UPDATE. Outside a transaction
+# on_commit runs at once, so nothing waits.
+def _schedule_refresh(pks, reindex):
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    connection = transaction.get_connection()
+    pending = getattr(connection, "asset_refresh", None)
+    if pending is None:
+        pending = connection.asset_refresh = {"touch": set(), "reindex": set()}
+    pending["reindex" if reindex else "touch"].update(pks)
+    # Every call registers the flush: one registered in a savepoint that
+    # rolls back is dropped, and a flush with nothing pending does nothing.
+    # Ids left by a rolled back transaction go out with the next flush,
+    # which only costs a redundant refresh.
+    transaction.on_commit(lambda: _refresh(connection))
+
+
+def _refresh(connection):
+    pending = connection.asset_refresh
+    reindex, touch = pending["reindex"], pending["touch"] - pending["reindex"]
+    connection.asset_refresh = {"touch": set(), "reindex": set()}
+    if reindex:
+        reindex_assets(reindex)
+    if touch:
+        Asset.objects.filter(pk__in=touch).update(updated_at=timezone.now())
+
+
+def invalidate_all_assets():
+    """
+    Invalidate every cached asset after commit. With the default
+    local-memory backend this reaches the current process only, so writes
+    that change what assets show must also move their updated_at (see
+    touch_assets) for other processes to notice.
+    """
+    transaction.on_commit(lambda: asset_cache().set(GLOBAL_GENERATION, time.time_ns(), None))
+
+
+# ---------------------------------------------------------------------
+# LOOKUP
+# ---------------------------------------------------------------------
+def representation_key(pk, version, current_version_id, updated_at, variant):
+    """
+    Key for one asset representation. `variant` covers everything else the
+    output depends on (host for absolute URLs, ?fields=, ?expand=).
+    """
+    generation = shared_generation()
+    digest = hashlib.md5(variant.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{pk}:v{version}:{current_version_id}:{updated_at.timestamp()}:{generation}:{digest}"
+
+
+def cached_representation(key, build):
+    """Return the cached data for `key`, calling build() and storing it on a miss."""
+    cache = asset_cache()
+    data = cache.get(key)
+    if data is not None:
+        _count(cache, HITS)
+        return data
+    _count(cache, MISSES)
+    data = build()
+    cache.set(key, data, getattr(settings, "ASSET_CACHE_TIMEOUT", 300))
+    return data
+
+
+# ---------------------------------------------------------------------
+# COUNTERS
+# ---------------------------------------------------------------------
+def _count(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing or evicted; another process may race us here
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cache_counters():
+    cache = asset_cache()
+    counts = cache.get_many([HITS, MISSES])
+    hits, misses = counts.get(HITS, 0), counts.get(MISSES, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "backend": f"{type(cache).__module__}.{type(cache).__name__}",
+    }
@@ -0,0 +1,80 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+from .caching import shared_generation
+
+
+# ---------------------------------------------------------------------
+# ETAGS
+# ---------------------------------------------------------------------
+def make_etag(request, *parts):
+    """
+    Weak ETag over `parts` plus what else changes the body: the query
+    string and host (absolute URLs) and the shared-object generation.
+    """
+    raw = "|".join(str(p) for p in (*parts, request.get_host(), request.get_full_path(), shared_generation()))
+    return "W/" + quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    """A 304 response when If-None-Match matches `etag`, else None."""
+    return get_conditional_response(request, etag=etag)
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    # Clients may keep the body but must revalidate before reusing it
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def rows_etag(request, rows, updated_field, *parts):
+    """
+    ETag for a page from the rows it already fetched: each row's id and
+    change marker (`updated_field`, a "__" path followed through loaded
+    relations), plus `parts` such as the page's count and links.
+    """
+    markers = []
+    for row in rows:
+        value = row
+        for attr in updated_field.split("__"):
+            value = getattr(value, attr, None)
+        markers.append(f"{row.pk}:{value}")
+    return make_etag(request, ",".join(markers), *parts)
+
+
+# ---------------------------------------------------------------------
+# VIEWSET MIXIN
+# ---------------------------------------------------------------------
+class ConditionalListMixin:
+    """
+    Answer list requests whose If-None-Match still matches with a 304
+    before the page is serialized. The ETag comes from the page's rows
+    (id and `etag_updated_field`, an Asset.updated_at path) and its
+    count/links, so it costs no query beyond the page itself and keeps
+    cursor and ?count=approx pages free of a full-table aggregate.
+    """
+    etag_updated_field = "updated_at"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            rows = list(queryset)
+            etag = rows_etag(request, rows, self.etag_updated_field)
+        else:
+            rows = page
+            # count/next/previous are already computed by the paginator
+            links = self.get_paginated_response([]).data
+            etag = rows_etag(request, rows, self.etag_updated_field, sorted(links.items()))
+
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(rows, many=True)
+        if page is None:
+            return with_etag(Response(serializer.data), etag)
+        return with_etag(self.get_paginated_response(serializer.data), etag)
@@ -0,0 +1,132 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+from django.utils.text import slugify
+
+from .storage import blob_hash
+
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+# ---------------------------------------------------------------------
+# VALIDATORS
+# ---------------------------------------------------------------------
+def file_etag(fieldfile, version):
+    """Strong ETag from the blob hash; legacy files fall back to version/size/mtime."""
+    sha = blob_hash(fieldfile.name)
+    if sha:
+        return quote_etag(sha)
+    storage = fieldfile.storage
+    mtime = int(storage.get_modified_time(fieldfile.name).timestamp())
+    return quote_etag(f"v{version}-{fieldfile.size}-{mtime}")
+
+
+def download_filename(title, number, stored_name):
+    """"<slugified title>-v<n><ext of the stored file>", as offered to users."""
+    return f"{slugify(title) or 'asset'}-v{number}{os.path.splitext(stored_name)[1]}"
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single "bytes=" range, None to serve the whole
+    file, or "invalid" when the range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "invalid"
+    return start, end
+
+
+def _read_range(fh, start, length):
+    try:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+# ---------------------------------------------------------------------
+# RESPONSE
+# ---------------------------------------------------------------------
+def serve_file(request, fieldfile, etag, last_modified, filename, as_attachment=False):
+    """
+    Serve a stored file with conditional GET and single-range support.
+
+    ASSET_DOWNLOAD_OFFLOAD = "x-accel-redirect" (nginx) or "x-sendfile"
+    (Apache/lighttpd) hands the body to the web server after the checks;
+    otherwise full bodies go through FileResponse, which uses the server's
+    wsgi.file_wrapper (sendfile) where available.
+    """
+    last_modified_ts = int(last_modified.timestamp())
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if not_modified is not None:
+        return not_modified
+
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    offload = getattr(settings, "ASSET_DOWNLOAD_OFFLOAD", None)
+    size = fieldfile.size
+
+    if offload == "x-accel-redirect":
+        prefix = getattr(settings, "ASSET_DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + fieldfile.name
+    elif offload == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = fieldfile.path
+    else:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+        if_range = request.META.get("HTTP_IF_RANGE")
+        if byte_range and if_range and if_range != etag:
+            parsed = parse_http_date_safe(if_range)
+            if parsed is None or parsed < last_modified_ts:
+                byte_range = None
+
+        if byte_range == "invalid":
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _read_range(fieldfile.storage.open(fieldfile.name, "rb"), start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(length)
+        else:
+            response = FileResponse(fieldfile.storage.open(fieldfile.name, "rb"), content_type=content_type)
+            response["Content-Length"] = str(size)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified_ts)
+    # Private to the user, but always revalidated so approvals show up at once
+    response["Cache-Control"] = "private, no-cache"
+    response["Content-Disposition"] = content_disposition_header(as_attachment, os.path.basename(filename))
+    return response
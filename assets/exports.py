@@ -0,0 +1,150 @@
+"""Multi-asset ZIP exports streamed while they are built.
+
+zipfile writes into a sink the response generator drains after every
+chunk, so memory stays at one chunk whatever the archive size. The sink
+is not seekable, so entries carry data descriptors, and zipfile switches
+to ZIP64 records for entries or archives past 4 GiB / 65535 entries.
+"""
+import json
+import mimetypes
+import zipfile
+
+from django.utils import timezone
+
+from .downloads import CHUNK_SIZE, download_filename
+from .storage import blob_hash
+
+MANIFEST_NAME = "manifest.json"
+
+# Deflating these gains almost nothing and costs CPU: store them as-is
+STORED_PREFIXES = ("image/", "video/", "audio/")
+DEFLATED_MEDIA = {"image/svg+xml", "image/bmp", "image/x-ms-bmp", "image/tiff"}
+STORED_TYPES = {
+    "application/zip",
+    "application/gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+
+def compress_type(filename):
+    mime = mimetypes.guess_type(filename)[0] or ""
+    if mime in STORED_TYPES or (mime.startswith(STORED_PREFIXES) and mime not in DEFLATED_MEDIA):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+# ---------------------------------------------------------------------
+# ENTRIES
+# ---------------------------------------------------------------------
+def export_entries(assets):
+    """
+    Return (files, manifest) for the current approved file of each asset.
+    files are (archive name, fieldfile, size, modified) tuples; assets whose
+    file is missing from storage are listed in the manifest with an error.
+    """
+    files, items, used = [], [], set()
+    for asset in assets:
+        version = asset.current_version
+        fieldfile = version.file if version and version.file else asset.file
+        number = version.version if version else asset.version
+        title = (version.title if version else None) or asset.title
+        category = (version.category if version else None) or asset.category
+        item = {
+            "id": asset.pk,
+            "title": title,
+            "description": (version.description if version else None) or asset.description,
+            "version": number,
+            "category": category.name if category else None,
+            "tags": sorted(t.name for t in (version.tags.all() if version else asset.tags.all())),
+            "uploaded_by": asset.uploaded_by.username if asset.uploaded_by else None,
+            "uploaded_at": asset.uploaded_at.isoformat(),
+            "approved_at": version.uploaded_at.isoformat() if version else None,
+            "metadata": asset.metadata,
+            "file": None,
+        }
+        try:
+            size = fieldfile.size if fieldfile else None
+        except OSError:
+            size = None
+        if size is None:
+            item["error"] = "file missing"
+            items.append(item)
+            continue
+
+        name = download_filename(title, number, fieldfile.name)
+        if name in used:
+            stem, dot, ext = name.rpartition(".")
+            name = f"{stem}-{asset.pk}.{ext}" if dot else f"{name}-{asset.pk}"
+        used.add(name)
+        item.update({"file": name, "size": size, "sha256": blob_hash(fieldfile.name)})
+        items.append(item)
+        files.append((name, fieldfile, size, version.uploaded_at if version else asset.uploaded_at))
+
+    manifest = {"exported_at": timezone.now().isoformat(), "count": len(items), "assets": items}
+    return files, manifest
+
+
+# ---------------------------------------------------------------------
+# STREAMING
+# ---------------------------------------------------------------------
+class _Sink:
+    """Write-only, unseekable file object that zipfile writes the archive into."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_info(name, modified, size):
+    local = timezone.localtime(modified) if timezone.is_aware(modified) else modified
+    info = zipfile.ZipInfo(name, date_time=max(local.timetuple()[:6], (1980, 1, 1, 0, 0, 0)))
+    info.compress_type = compress_type(name)
+    info.external_attr = 0o644 << 16
+    # Known up front, so zipfile writes ZIP64 headers for entries past 4 GiB
+    info.file_size = size
+    return info
+
+
+def stream_zip(files, manifest):
+    """Iterate over the archive bytes: the manifest first, then each file."""
+    return (chunk for chunk in _zip_chunks(files, manifest) if chunk)
+
+
+def _zip_chunks(files, manifest):
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w") as archive:
+        body = json.dumps(manifest, indent=2, default=str).encode()
+        archive.writestr(_zip_info(MANIFEST_NAME, timezone.now(), len(body)), body, compress_type=zipfile.ZIP_DEFLATED)
+        yield sink.drain()
+
+        for name, fieldfile, size, modified in files:
+            with fieldfile.storage.open(fieldfile.name, "rb") as src, archive.open(_zip_info(name, modified, size), "w") as dest:
+                while chunk := src.read(CHUNK_SIZE):
+                    dest.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    # Central directory, written when the archive closes
+    yield sink.drain()
@@ -0,0 +1,193 @@
+import os
+
+from django.db import transaction
+
+from .models import Asset, AssetVersion, Category, Tag
+from .search import search_values
+from .renditions import schedule_renditions
+from .metadata import client_metadata, schedule_metadata_extraction
+from .stats import invalidate_stats
+
+
+# ---------------------------------------------------------------------
+# TAGS
+# ---------------------------------------------------------------------
+def clean_tag_names(names):
+    """Strip, drop blanks and de-duplicate tag names, keeping their order."""
+    if isinstance(names, str):
+        names = names.split(",")
+    return list(dict.fromkeys(n.strip() for n in names or [] if n and n.strip()))
+
+
+def resolve_tags(names):
+    """
+    Return {name: Tag} for all names in request order. Existing tags cost
+    one SELECT; missing ones are created with a single INSERT and read
+    back (ignore_conflicts leaves their ids unset, and a concurrent writer
+    may have created some of them first).
+    """
+    names = clean_tag_names(names)
+    if not names:
+        return {}
+    found = {t.name: t for t in Tag.objects.filter(name__in=names)}
+    missing = [n for n in names if n not in found]
+    if missing:
+        Tag.objects.bulk_create([Tag(name=n) for n in missing], ignore_conflicts=True)
+        found.update((t.name, t) for t in Tag.objects.filter(name__in=missing))
+    return {n: found[n] for n in names if n in found}
+
+
+def set_tags(obj, names):
+    """
+    Replace the tags of an Asset or AssetVersion with `names` and return
+    the Tag objects. The query count does not depend on the number of
+    tags: related manager set() diffs against the current rows, deleting
+    and inserting only what changed (and still sends m2m_changed).
+    """
+    tags = list(resolve_tags(names).values())
+    obj.tags.set(tags)
+    return tags
+
+
+def resolve_category(value):
+    """Return the Category for an id or a name, or None."""
+    if not value:
+        return None
+    try:
+        return Category.objects.filter(id=int(value)).first()
+    except (ValueError, TypeError):
+        return Category.objects.filter(name=value).first()
+
+
+# ---------------------------------------------------------------------
+# BULK INGEST
+# ---------------------------------------------------------------------
+def store_file(content, filename):
+    """Stream an upload into Asset.file's storage and return the stored name."""
+    field = Asset._meta.get_field("file")
+    name = field.generate_filename(None, os.path.basename(filename))
+    return field.storage.save(name, content, max_length=field.max_length)
+
+
+def _item_filename(item):
+    return item["file"].name if "file" in item else item["filename"]
+
+
+def ingest_assets(items, user):
+    """
+    Create one approved Asset (plus its initial AssetVersion) per item.
+
+    Each item is a dict with a "file" (Django File/UploadedFile) and optional
+    "title", "description", "category_id", "tags" and "metadata". Files are
+    streamed to storage chunk by chunk; rows are written with bulk_create in
+    a single transaction, so a batch costs a fixed number of queries.
+    Items that are already in blob storage pass "stored_name" and
+    "filename" instead of "file".
+    """
+    if not items:
+        return []
+
+    tags_by_name = resolve_tags([n for item in items for n in clean_tag_names(item.get("tags"))])
+    categories = Category.objects.in_bulk({item["category_id"] for item in items if item.get("category_id")})
+
+    # Blobs are content-addressed and may already be shared with other
+    # assets, so a failed batch leaves them for gc_blobs instead of deleting.
+    stored = [item.get("stored_name") or store_file(item["file"], item["file"].name) for item in items]
+
+    with transaction.atomic():
+        assets = Asset.objects.bulk_create([
+            Asset(
+                title=item.get("title") or os.path.splitext(os.path.basename(_item_filename(item)))[0],
+                description=item.get("description") or "",
+                file=name,
+                uploaded_by=user,
+                category=categories.get(item.get("category_id")),
+                metadata=item.get("metadata"),
+            )
+            for item, name in zip(items, stored)
+        ])
+        versions = AssetVersion.objects.bulk_create([
+            AssetVersion(
+                asset=asset,
+                file=asset.file.name,
+                uploaded_by=user,
+                version=asset.version,
+                status="approved",
+                title=asset.title,
+                description=asset.description,
+                category_id=asset.category_id,
+            )
+            for asset in assets
+        ])
+
+        asset_tags, version_tags = [], []
+        for item, asset, version in zip(items, assets, versions):
+            for name in clean_tag_names(item.get("tags")):
+                tag = tags_by_name[name]
+                asset_tags.append(Asset.tags.through(asset_id=asset.pk, tag_id=tag.pk))
+                version_tags.append(AssetVersion.tags.through(assetversion_id=version.pk, tag_id=tag.pk))
+        Asset.tags.through.objects.bulk_create(asset_tags)
+        AssetVersion.tags.through.objects.bulk_create(version_tags)
+
+        # Pointer and search text in one bulk UPDATE
+        search_fields = []
+        for item, asset, version in zip(items, assets, versions):
+            asset.current_version = version
+            values = search_values(asset, tag_names=clean_tag_names(item.get("tags")))
+            for field, value in values.items():
+                setattr(asset, field, value)
+            search_fields = list(values)
+        Asset.objects.bulk_update(assets, ["current_version", *search_fields])
+
+        schedule_renditions(*versions)
+        schedule_metadata_extraction(*assets)
+        invalidate_stats()
+
+    return assets
+
+
+# ---------------------------------------------------------------------
+# NEW VERSIONS
+# ---------------------------------------------------------------------
+def submit_version(asset, user, file, comment="", title=None, description=None, category=None, tags=None):
+    """
+    Create a pending AssetVersion for admin approval. `file` may be an
+    upload, a FieldFile or a stored blob name; `tags` is comma separated.
+    """
+    last_version = asset.version or 1
+    version = AssetVersion.objects.create(
+        asset=asset,
+        file=file,
+        uploaded_by=user,
+        version=last_version + 1,
+        status="pending",
+        comment=comment,
+        title=title,
+        description=description,
+        category=category,
+    )
+
+    # Set tags if provided
+    if tags:
+        version.tags.add(*resolve_tags(tags).values())
+
+    schedule_renditions(version)
+    return version
+
+
+def manifest_item(file, entry=None, tags=None, category_id=None):
+    """
+    Build an ingest item for one file. `entry` is its manifest record;
+    `tags` and `category_id` are batch-wide defaults it may override.
+    Raises ValueError for a non-numeric category id.
+    """
+    entry = entry or {}
+    category_id = entry.get("category_id", category_id)
+    return {
+        "file": file,
+        "title": entry.get("title"),
+        "description": entry.get("description"),
+        "tags": entry.get("tags", tags),
+        "category_id": int(category_id) if category_id not in (None, "") else None,
+        "metadata": client_metadata(entry.get("metadata")),
+    }
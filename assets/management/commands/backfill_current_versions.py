@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from assets.models import Asset, AssetVersion
+
+
+class Command(BaseCommand):
+    help = "Point Asset.current_version at each asset's latest approved version."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many assets are out of sync without writing.",
+        )
+
+    def handle(self, *args, **options):
+        latest_approved = AssetVersion.objects.filter(
+            asset=OuterRef("pk"), status="approved"
+        ).order_by("-version").values("pk")[:1]
+
+        assets = Asset.objects.annotate(latest_approved_id=Subquery(latest_approved))
+        stale = [a for a in assets.only("pk", "current_version") if a.current_version_id != a.latest_approved_id]
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(stale)} asset(s) need their current version updated.")
+            return
+
+        for asset in stale:
+            asset.current_version_id = asset.latest_approved_id
+        Asset.objects.bulk_update(stale, ["current_version"], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated current version for {len(stale)} asset(s)."))
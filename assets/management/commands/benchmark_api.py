@@ -0,0 +1,174 @@
+import json
+import random
+import statistics
+from collections import Counter
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from assets.benchmarking import api_client, clear_caches, latency_summary, timed_request
+from assets.models import Asset, AssetVersion, Tag, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the asset list/detail/search/filter, review queue, upload and "
+        "approval endpoints in-process and record latency percentiles and "
+        "query counts as JSON. Writes are rolled back unless --keep is given. "
+        "Use generate_scale_data for a realistic library first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30, help="Timed requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per scenario first.")
+        parser.add_argument("--seed", type=int, default=1, help="Seed for picking asset ids.")
+        parser.add_argument("--search", default="campaign", help="Term for the search scenario.")
+        parser.add_argument("--only", help="Comma-separated scenario names to run.")
+        parser.add_argument("--warm", action="store_true", help="Keep caches between requests (default: clear them before each).")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Baseline JSON from an earlier --output run.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown against --compare (0.25 = 25%%).")
+        parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore p95 slowdowns smaller than this.")
+        parser.add_argument("--keep", action="store_true", help="Commit uploads and approvals instead of rolling back.")
+
+    # -------------------- Scenarios --------------------
+    def sample_asset_ids(self, rng, count):
+        """Spread over the id range without loading every id."""
+        ids = Asset.objects.order_by("pk").values_list("pk", flat=True)
+        first, last = ids.first(), ids.last()
+        if first is None:
+            return []
+        return [ids.filter(pk__gte=rng.randint(first, last)).first() for _ in range(count)]
+
+    def get_scenarios(self, options, count):
+        """(name, method, path(i), data(i) or None, extra headers)"""
+        rng = random.Random(options["seed"])
+        asset_ids = self.sample_asset_ids(rng, count)
+        sample = Asset.objects.filter(pk__in=asset_ids[:1]).first()
+        category_id = Asset.objects.filter(category__isnull=False).values_list("category_id", flat=True).first()
+        top_tag = (
+            Tag.objects.annotate(asset_count=Count("assets")).order_by("-asset_count").values_list("name", flat=True).first()
+        )
+        client_name = (sample.metadata or {}).get("client") if sample else None
+        pending = list(AssetVersion.objects.filter(status="pending").order_by("pk").values_list("pk", flat=True)[:count])
+
+        scenarios = [
+            ("assets.list", "GET", lambda i: "/api/assets/", None, {}),
+            ("assets.list.cursor", "GET", lambda i: "/api/assets/?pagination=cursor", None, {}),
+            ("assets.detail", "GET", lambda i: f"/api/assets/{asset_ids[i]}/", None, {}),
+            ("assets.search", "GET", lambda i: f"/api/assets/?search={options['search']}", None, {}),
+            ("assets.filter.category", "GET", lambda i: f"/api/assets/?category={category_id}", None, {}),
+            ("assets.filter.tag", "GET", lambda i: f"/api/assets/?tags={top_tag}", None, {}),
+            ("assets.filter.mime_type", "GET", lambda i: "/api/assets/?mime_type=image/png", None, {}),
+            ("assets.filter.meta", "GET", lambda i: f"/api/assets/?meta.client={client_name}", None, {}),
+            ("versions.review_queue", "GET", lambda i: "/api/versions/review-queue/?status=pending", None, {}),
+            ("stats", "GET", lambda i: "/api/stats/", None, {}),
+            (
+                "assets.upload", "POST", lambda i: "/api/assets/",
+                lambda i: {"title": f"benchmark upload {i}", "file": SimpleUploadedFile(f"bench-{i}.txt", b"benchmark\n")},
+                {},
+            ),
+        ]
+        if len(pending) >= count:
+            scenarios.append((
+                "versions.approve", "PATCH", lambda i: f"/api/versions/{pending[i]}/",
+                lambda i: json.dumps({"status": "approved"}), {"content_type": "application/json"},
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(f"Skipping versions.approve: needs {count} pending versions, found {len(pending)}."))
+        if not asset_ids:
+            scenarios = [s for s in scenarios if s[0] != "assets.detail"]
+        return scenarios
+
+    # -------------------- Running --------------------
+    def run_scenario(self, client, method, path, data, extra, options):
+        timings, queries, statuses = [], [], Counter()
+        warmup, iterations = options["warmup"], options["iterations"]
+        for i in range(warmup + iterations):
+            if not options["warm"]:
+                clear_caches()
+            response, elapsed, sql = timed_request(client, method, path(i), data(i) if data else None, **extra)
+            if i < warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(len(sql))
+            statuses[str(response.status_code)] += 1
+        return {
+            "method": method,
+            "path": path(warmup),
+            "requests": iterations,
+            "status": dict(statuses),
+            "latency_ms": latency_summary(timings),
+            "queries": {"min": min(queries), "median": statistics.median(queries), "max": max(queries)},
+        }
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1 or options["warmup"] < 0:
+            raise CommandError("--iterations must be positive and --warmup not negative.")
+        admin = User.objects.filter(role="admin", is_active=True).order_by("pk").first()
+        if admin is None:
+            raise CommandError("No active user with role=admin to authenticate as.")
+        only = set(options["only"].split(",")) if options["only"] else None
+
+        results = {
+            "generated_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "rows": {
+                "assets": Asset.objects.count(),
+                "versions": AssetVersion.objects.count(),
+                "tags": Tag.objects.count(),
+            },
+            "options": {k: options[k] for k in ("iterations", "warmup", "seed", "search", "warm")},
+            "scenarios": {},
+        }
+        self.stdout.write(f"{results['rows']['assets']} assets, {results['rows']['versions']} versions ({connection.vendor})")
+
+        with transaction.atomic():
+            scenarios = self.get_scenarios(options, options["warmup"] + options["iterations"])
+            for name, method, path, data, extra in scenarios:
+                if only and name not in only:
+                    continue
+                result = self.run_scenario(api_client(admin), method, path, data, extra, options)
+                results["scenarios"][name] = result
+                latency = result["latency_ms"]
+                self.stdout.write(
+                    f"{name:<26} p50 {latency['p50']:>8.1f}  p95 {latency['p95']:>8.1f}  p99 {latency['p99']:>8.1f} ms  "
+                    f"queries {result['queries']['max']:>3}  {result['status']}"
+                )
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if options["compare"]:
+            self.compare(results, options)
+
+    # -------------------- Baseline comparison --------------------
+    def compare(self, results, options):
+        with open(options["compare"]) as fh:
+            baseline = json.load(fh)
+        if baseline.get("rows") != results["rows"]:
+            self.stdout.write(self.style.WARNING(f"Baseline was recorded with {baseline.get('rows')}; timings may not compare."))
+
+        regressions = []
+        for name, result in results["scenarios"].items():
+            before = baseline.get("scenarios", {}).get(name)
+            if before is None:
+                continue
+            p95, old_p95 = result["latency_ms"]["p95"], before["latency_ms"]["p95"]
+            queries, old_queries = result["queries"]["max"], before["queries"]["max"]
+            change = (p95 - old_p95) / old_p95 if old_p95 else 0
+            self.stdout.write(f"{name:<26} p95 {old_p95:.1f} -> {p95:.1f} ms ({change:+.0%})  queries {old_queries} -> {queries}")
+            if change > options["tolerance"] and p95 - old_p95 >= options["min_delta_ms"]:
+                regressions.append(f"{name}: p95 {old_p95:.1f} -> {p95:.1f} ms")
+            if queries > old_queries:
+                regressions.append(f"{name}: queries {old_queries} -> {queries}")
+
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
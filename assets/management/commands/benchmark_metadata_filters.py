@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from assets.management.commands.check_query_plans import FULL_SCAN
+from assets.models import Asset, User
+from assets.views import AssetFilter
+
+MIME_TYPES = ["image/jpeg", "image/png", "video/mp4", "application/pdf"]
+
+# label -> AssetFilter params; each selects roughly 0.1% of the rows or less
+QUERIES = [
+    ("registered text", {"meta.client": "client7"}),
+    ("registered text, rare", {"meta.project": "P123"}),
+    ("registered int range", {"meta.technical.width__gte": "7990"}),
+    ("registered bigint range", {"meta.technical.size_bytes__lte": "50000"}),
+    ("unregistered (GIN)", {"meta.batch": "17"}),
+    ("unregistered in (GIN)", {"meta.batch__in": "17,18"}),
+    ("combined", {"mime_type": "application/pdf", "meta.client": "client7"}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load synthetic assets (1M by default) and check that ?meta.* filters "
+        "stay index-backed at that size. Rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=1_000_000, help="Synthetic rows to add (0 reuses existing data).")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5, help="Timed executions per query.")
+        parser.add_argument("--keep", action="store_true", help="Commit the synthetic rows instead of rolling back.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plans.")
+        parser.add_argument("--fail-on-scan", action="store_true", help="Exit with an error if any query scans the table.")
+
+    def populate(self, count, batch_size):
+        user = User.objects.order_by("pk").first() or User.objects.create_user("benchmark", role="admin")
+        start = time.perf_counter()
+        for offset in range(0, count, batch_size):
+            Asset.objects.bulk_create([
+                Asset(
+                    title=f"bench {i}",
+                    file=f"bench/{i}.jpg",
+                    uploaded_by=user,
+                    metadata={
+                        "client": f"client{i % 500}",
+                        "project": f"P{i % 20000}",
+                        "batch": i % 1000,
+                        "technical": {
+                            "mime_type": MIME_TYPES[i % len(MIME_TYPES)],
+                            "width": 320 + (i * 7919) % 7680,
+                            "height": 240 + (i * 6271) % 4320,
+                            "size_bytes": (i * 104729) % 50_000_000,
+                        },
+                    },
+                )
+                for i in range(offset, min(offset + batch_size, count))
+            ])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE assets_asset" if connection.vendor == "postgresql" else "ANALYZE")
+        self.stdout.write(f"Loaded {count} assets in {time.perf_counter() - start:.1f} s")
+
+    def handle(self, *args, **options):
+        scans = []
+        with transaction.atomic():
+            if options["assets"] > 0:
+                self.populate(options["assets"], options["batch_size"])
+            self.stdout.write(f"{Asset.objects.count()} assets in table ({connection.vendor})")
+
+            for label, params in QUERIES:
+                # The first page, as the API would serve it
+                page = AssetFilter(params, queryset=Asset.objects.all()).qs[:50]
+                plan = page.explain()
+                tables = sorted({a or b for a, b in FULL_SCAN.findall(plan)})
+
+                timings = []
+                for _ in range(max(options["repeat"], 1)):
+                    start = time.perf_counter()
+                    rows = len(list(page.all()))
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                if tables:
+                    scans.append(label)
+                    status = self.style.WARNING(f"SCAN ({', '.join(tables)})")
+                else:
+                    status = self.style.SUCCESS("INDEX")
+                self.stdout.write(f"{label:<26} {status:<30} best {min(timings):.2f} ms ({rows} rows)")
+                if options["verbose_plans"]:
+                    self.stdout.write(plan + "\n")
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        if scans and options["fail_on_scan"]:
+            raise CommandError(f"Full table scans in: {', '.join(scans)}")
@@ -0,0 +1,335 @@
+import json
+import re
+import statistics
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.urls import URLResolver, get_resolver
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from assets.benchmarking import api_client, clear_caches, timed_request
+from assets.ingest import store_file
+from assets.models import Asset, AssetVersion, Category, Rendition, Tag, UploadSession, User
+
+# Default response-time budgets (ms, scaled by --time-factor)
+READ_MS = 250
+WRITE_MS = 1000
+HASHING_MS = 2000  # endpoints that hash a password
+
+
+def upload(name="budget.txt"):
+    return SimpleUploadedFile(name, b"query budget\n", content_type="text/plain")
+
+
+def as_json(data):
+    return {"data": json.dumps(data), "content_type": "application/json"}
+
+
+def multipart(data):
+    # Encoded here: the test client only encodes multipart bodies for POST
+    return {"data": encode_multipart(BOUNDARY, data), "content_type": MULTIPART_CONTENT}
+
+
+# ---------------------------------------------------------------------
+# BUDGETS
+# ---------------------------------------------------------------------
+# (route name, method, max queries, max ms, request(ctx) -> (path, kwargs))
+# GETs run against one row and against a full page of rows: the budget
+# holds for both, and any difference means the count scales with rows.
+# Writes run once, in this order, after the reads.
+# Query budgets are the measured count plus 10% (at least one query) so
+# unrelated changes do not trip them; growth with rows or tags is still
+# caught exactly. Routes that must not touch the database stay at 0. The
+# PostgreSQL-only paths (FOR SHARE, tsvector updates) issue the same
+# number of statements as their SQLite fallbacks. assets.tests runs the
+# same checks under `manage.py test`.
+READS = [
+    ("<root>", "GET", 0, READ_MS, lambda c: ("/", {})),
+    ("api-root", "GET", 2, READ_MS, lambda c: ("/api/", {})),
+    ("me", "GET", 2, READ_MS, lambda c: ("/api/me/", {})),
+    ("stats", "GET", 9, READ_MS, lambda c: ("/api/stats/", {})),
+    ("cache-stats", "GET", 2, READ_MS, lambda c: ("/api/stats/cache/", {})),
+    ("metrics", "GET", 0, READ_MS, lambda c: ("/metrics/", {"HTTP_AUTHORIZATION": f"Bearer {c['metrics_token']}"})),
+    ("user-list", "GET", 4, READ_MS, lambda c: ("/api/users/", {})),
+    ("user-detail", "GET", 3, READ_MS, lambda c: (f"/api/users/{c['viewer'].pk}/", {})),
+    ("category-list", "GET", 3, READ_MS, lambda c: ("/api/categories/", {})),
+    ("category-detail", "GET", 3, READ_MS, lambda c: (f"/api/categories/{c['category'].pk}/", {})),
+    ("tag-list", "GET", 4, READ_MS, lambda c: ("/api/tags/", {})),
+    ("tag-detail", "GET", 3, READ_MS, lambda c: (f"/api/tags/{c['tag'].pk}/", {})),
+    ("assets-list", "GET", 7, READ_MS, lambda c: ("/api/assets/", {})),
+    ("assets-detail", "GET", 10, READ_MS, lambda c: (f"/api/assets/{c['asset'].pk}/", {})),
+    ("assets-download", "GET", 3, READ_MS, lambda c: (f"/api/assets/{c['asset'].pk}/download/", {})),
+    ("assets-export", "GET", 6, READ_MS, lambda c: (f"/api/assets/export/?uploaded_by={c['admin'].pk}", {})),
+    ("assets-export", "POST", 5, READ_MS, lambda c: ("/api/assets/export/", as_json({"ids": [a.pk for a in c["assets"]]}))),
+    ("versions-list", "GET", 6, READ_MS, lambda c: ("/api/versions/", {})),
+    ("versions-detail", "GET", 6, READ_MS, lambda c: (f"/api/versions/{c['pending'][0].pk}/", {})),
+    ("versions-review-queue", "GET", 7, READ_MS, lambda c: ("/api/versions/review-queue/?status=pending", {})),
+    ("uploads-detail", "GET", 4, READ_MS, lambda c: (f"/api/uploads/{c['session'].pk}/", {})),
+]
+
+WRITES = [
+    ("token_obtain_pair", "POST", 2, HASHING_MS, lambda c: ("/api/token/", as_json({"username": c["admin"].username, "password": c["password"]}))),
+    ("token_refresh", "POST", 2, WRITE_MS, lambda c: ("/api/token/refresh/", as_json({"refresh": c["refresh"]}))),
+    ("tag-list", "POST", 4, WRITE_MS, lambda c: ("/api/tags/", as_json({"name": f"{c['prefix']}-new"}))),
+    ("tag-detail", "PATCH", 9, WRITE_MS, lambda c: (f"/api/tags/{c['tag'].pk}/", as_json({"name": f"{c['prefix']}-renamed"}))),
+    ("category-list", "POST", 4, WRITE_MS, lambda c: ("/api/categories/", as_json({"name": f"{c['prefix']} new"}))),
+    ("category-detail", "PATCH", 9, WRITE_MS, lambda c: (f"/api/categories/{c['category'].pk}/", as_json({"name": f"{c['prefix']} renamed"}))),
+    ("user-list", "POST", 4, HASHING_MS, lambda c: ("/api/users/", as_json({"username": f"{c['prefix']}-new", "password": "budget-pass-1", "role": "viewer"}))),
+    ("user-detail", "PATCH", 5, WRITE_MS, lambda c: (f"/api/users/{c['viewer'].pk}/", as_json({"role": "editor"}))),
+    ("assets-list", "POST", 32, WRITE_MS, lambda c: ("/api/assets/", multipart({"title": "budget upload", "category_id": c["category"].pk, "file": upload(), "tags[]": [c["tag"].name, "budget-extra"]}))),
+    ("assets-detail", "PATCH", 35, WRITE_MS, lambda c: (f"/api/assets/{c['asset'].pk}/", multipart({"tag_names": f"{c['tag'].name},budget-patch"}))),
+    ("assets-request-update", "POST", 23, WRITE_MS, lambda c: (f"/api/assets/{c['asset'].pk}/request_update/", multipart({"file": upload(), "tags": f"{c['tag'].name},budget-request"}))),
+    ("assets-bulk-ingest", "POST", 12, WRITE_MS, lambda c: ("/api/assets/bulk/", multipart({"files": [upload("a.txt"), upload("b.txt")], "tags": c["tag"].name}))),
+    ("versions-detail", "PATCH", 19, WRITE_MS, lambda c: (f"/api/versions/{c['pending'][0].pk}/", as_json({"status": "approved"}))),
+    ("versions-bulk-review", "POST", 11, WRITE_MS, lambda c: ("/api/versions/bulk-review/", as_json({"ids": [v.pk for v in c["pending"][1:]], "status": "rejected"}))),
+    ("uploads-list", "POST", 4, WRITE_MS, lambda c: ("/api/uploads/", as_json({"filename": "budget.txt", "size": 13}))),
+    ("uploads-upload-part", "PUT", 13, WRITE_MS, lambda c: (f"/api/uploads/{c['new_session']}/parts/1/", {"data": b"query budget\n", "content_type": "application/octet-stream"})),
+    ("uploads-complete", "POST", 25, WRITE_MS, lambda c: (f"/api/uploads/{c['new_session']}/complete/", {})),
+    ("uploads-detail", "DELETE", 6, WRITE_MS, lambda c: (f"/api/uploads/{c['session'].pk}/", {})),
+    ("versions-detail", "DELETE", 10, WRITE_MS, lambda c: (f"/api/versions/{c['pending'][-1].pk}/", {})),
+    ("assets-detail", "DELETE", 22, WRITE_MS, lambda c: (f"/api/assets/{c['assets'][-1].pk}/", {})),
+    ("tag-detail", "DELETE", 7, WRITE_MS, lambda c: (f"/api/tags/{c['tags'][-1].pk}/", {})),
+    ("category-detail", "DELETE", 7, WRITE_MS, lambda c: (f"/api/categories/{c['categories'][-1].pk}/", {})),
+    ("user-detail", "DELETE", 11, WRITE_MS, lambda c: (f"/api/users/{c['users'][-1].pk}/", {})),
+]
+
+# Writes that take a tag list must cost the same with 1 and TAG_COUNT tags
+TAG_COUNT = 30
+TAG_WRITES = [
+    ("assets-list", "POST", lambda c, tags: ("/api/assets/", multipart({"title": "budget tags", "file": upload(), "tag_names": ",".join(tags)}))),
+    ("assets-detail", "PATCH", lambda c, tags: (f"/api/assets/{c['asset'].pk}/", multipart({"tag_names": ",".join(tags)}))),
+    ("assets-request-update", "POST", lambda c, tags: (f"/api/assets/{c['asset'].pk}/request_update/", multipart({"file": upload(), "tags": ",".join(tags)}))),
+]
+
+# Routes and methods deliberately left out, with the reason
+NOT_MEASURED = {
+    ("user-detail", "PUT"): "same handler as PATCH",
+    ("assets-detail", "PUT"): "same handler as PATCH",
+    ("category-detail", "PUT"): "same handler as PATCH",
+    ("tag-detail", "PUT"): "same handler as PATCH",
+    ("versions-detail", "PUT"): "same handler as PATCH",
+    ("versions-list", "POST"): "new versions go through assets/<id>/request_update/",
+}
+
+# Quoted strings and numbers, replaced by ? to group statements
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# After a POST, remember the new object's id for the requests that follow
+REMEMBER = {("uploads-list", "POST"): "new_session"}
+
+
+# ---------------------------------------------------------------------
+# ROUTES
+# ---------------------------------------------------------------------
+def registered_routes():
+    """{(route name, METHOD)} for everything in ROOT_URLCONF except the admin site and media."""
+    routes = set()
+
+    def walk(patterns, prefix="", namespace=None):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern), pattern.namespace or namespace)
+            else:
+                yield namespace, pattern, prefix + str(pattern.pattern)
+
+    for namespace, pattern, route in walk(get_resolver().url_patterns):
+        if namespace == "admin" or route.lstrip("^").startswith(settings.MEDIA_URL.strip("/")):
+            continue
+        name = pattern.name or (route or "<root>")
+        callback = pattern.callback
+        if getattr(callback, "actions", None):
+            methods = callback.actions
+        elif getattr(callback, "view_class", None):
+            methods = [m for m in ("get", "post", "put", "patch", "delete") if hasattr(callback.view_class, m)]
+        else:
+            methods = ["get"]
+        routes.update((name, method.upper()) for method in methods)
+    return routes
+
+
+class Command(BaseCommand):
+    help = (
+        "Call every API route with fixture data in a throwaway test database "
+        "and fail when a route exceeds its declared query count or response "
+        "time, when a read's query count grows with the rows it returns or a "
+        "write's with the tags it sets, or when a route has no budget. "
+        "Prints the repeated SQL of offenders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per read; the median time counts.")
+        parser.add_argument("--time-factor", type=float, default=1.0, help="Multiply every time budget (slow CI machines).")
+        parser.add_argument("--no-time", action="store_true", help="Check query counts only.")
+        parser.add_argument("--show-sql", action="store_true", help="Print the SQL of every request.")
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the test database between runs.")
+
+    # -------------------- Fixture --------------------
+    def add_rows(self, ctx, count):
+        """Add `count` users, categories, tags and assets (approved v1 with a rendition, pending v2)."""
+        prefix, n = ctx["prefix"], len(ctx["assets"])
+        users = User.objects.bulk_create([User(username=f"{prefix}-viewer-{n + i}", role="viewer") for i in range(count)])
+        categories = Category.objects.bulk_create([Category(name=f"{prefix} category {n + i}") for i in range(count)])
+        tags = Tag.objects.bulk_create([Tag(name=f"{prefix}-tag-{n + i}") for i in range(count)])
+        for i in range(count):
+            asset = Asset.objects.create(
+                title=f"{prefix} asset {n + i}", file=ctx["blob"], uploaded_by=ctx["admin"], category=categories[i],
+                metadata={"client": "budget"},
+            )
+            asset.tags.set([tags[i], ctx["tags"][0] if ctx["tags"] else tags[0]])
+            current = AssetVersion.objects.create(
+                asset=asset, file=ctx["blob"], uploaded_by=ctx["admin"], version=1, status="approved",
+                title=asset.title, category=asset.category,
+            )
+            current.tags.set(asset.tags.all())
+            Rendition.objects.create(version=current, kind="thumbnail", file=ctx["blob"], width=8, height=8)
+            pending = AssetVersion.objects.create(
+                asset=asset, file=ctx["blob"], uploaded_by=ctx["admin"], version=2, status="pending",
+            )
+            asset.current_version = current
+            asset.save(update_fields=["current_version"])
+            ctx["assets"].append(asset)
+            ctx["pending"].append(pending)
+        ctx["users"] += users
+        ctx["categories"] += categories
+        ctx["tags"] += tags
+
+    def build_fixture(self):
+        prefix = f"budget-{uuid.uuid4().hex[:8]}"
+        password = uuid.uuid4().hex
+        admin = User.objects.create_user(f"{prefix}-admin", password=password, role="admin", is_staff=True)
+        ctx = {
+            "prefix": prefix, "admin": admin, "password": password, "refresh": str(RefreshToken.for_user(admin)),
+            "metrics_token": settings.METRICS_TOKEN,
+            "blob": store_file(ContentFile(b"query budget\n"), "budget.txt"),
+            "assets": [], "pending": [], "users": [], "categories": [], "tags": [],
+        }
+        ctx["session"] = UploadSession.objects.create(user=admin, filename="budget.txt", size=13, part_size=13)
+        self.add_rows(ctx, 1)
+        ctx["asset"], ctx["category"], ctx["tag"], ctx["viewer"] = ctx["assets"][0], ctx["categories"][0], ctx["tags"][0], ctx["users"][0]
+        return ctx
+
+    # -------------------- Measuring --------------------
+    def measure(self, client, method, path, kwargs, repeat):
+        """(max queries, median ms, status, sql of the worst run, response) with cold caches."""
+        runs = []
+        for _ in range(repeat):
+            clear_caches()
+            response, elapsed, sql = timed_request(client, method, path, **kwargs)
+            runs.append((len(sql), elapsed, response.status_code, sql, response))
+        worst = max(runs, key=lambda r: r[0])
+        return worst[0], statistics.median(r[1] for r in runs), worst[2], worst[3], worst[4]
+
+    def check_budget(self, label, budget_queries, budget_ms, queries, ms, status, sql, options):
+        problems = []
+        if status >= 400:
+            problems.append(f"status {status}")
+        if queries > budget_queries:
+            problems.append(f"{queries} queries > budget {budget_queries}")
+        if not options["no_time"] and ms > budget_ms * options["time_factor"]:
+            problems.append(f"{ms:.0f} ms > budget {budget_ms * options['time_factor']:.0f} ms")
+        line = f"{label:<42} {queries:>3} queries (budget {budget_queries:>2})  {ms:>7.1f} ms"
+        if problems:
+            self.stdout.write(self.style.ERROR(f"{line}  FAIL: {'; '.join(problems)}"))
+            self.print_sql(sql, only_repeated=queries <= budget_queries and not options["show_sql"])
+        else:
+            self.stdout.write(line)
+            if options["show_sql"]:
+                self.print_sql(sql)
+        return [f"{label}: {p}" for p in problems]
+
+    def print_sql(self, sql, only_repeated=False):
+        # Statements that differ only in their literals count as repeats (N+1)
+        repeated = [(n, s) for s, n in Counter(LITERALS.sub("?", s) for s in sql).most_common() if n > 1]
+        if repeated:
+            self.stdout.write("    repeated statements:")
+            for n, statement in repeated:
+                self.stdout.write(f"    {n}x {statement}")
+        if not only_repeated:
+            for statement in sql:
+                self.stdout.write(f"    {statement}")
+
+    def handle(self, *args, **options):
+        # A separate database, so lists return exactly the fixture rows
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+        try:
+            failures = self.check_all(options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+
+        for (name, method), reason in sorted(NOT_MEASURED.items()):
+            self.stdout.write(f"not measured: {method} {name} ({reason})")
+        if failures:
+            raise CommandError(f"{len(failures)} query budget failure(s):\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All endpoints within their query and time budgets."))
+
+    def check_all(self, options):
+        """Every failure as a line of text; run against an empty (test) database."""
+        declared = {(name, method) for name, method, *_ in READS + WRITES}
+        routes = registered_routes()
+        failures = [f"{name} {method}: no budget declared" for name, method in sorted(routes - declared - set(NOT_MEASURED))]
+        failures += [f"{name} {method}: budget for a route that does not exist" for name, method in sorted(declared - routes)]
+        with override_settings(METRICS_TOKEN=uuid.uuid4().hex):
+            failures += self.run_checks(options)
+        return failures
+
+    def run_checks(self, options):
+        failures = []
+        rows = api_settings.PAGE_SIZE + 2
+        with transaction.atomic():
+            ctx = self.build_fixture()
+            client = api_client(ctx["admin"])
+
+            first = {}
+            for stage in ("1 row", f"{rows} rows"):
+                if stage != "1 row":
+                    self.add_rows(ctx, rows - 1)
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Reads ({stage} of each model)"))
+                for name, method, budget_queries, budget_ms, build in READS:
+                    path, kwargs = build(ctx)
+                    queries, ms, status, sql, _ = self.measure(client, method, path, kwargs, options["repeat"])
+                    label = f"{method} {name}"
+                    failures += [f"{f} ({stage})" for f in self.check_budget(label, budget_queries, budget_ms, queries, ms, status, sql, options)]
+                    if (name, method) not in first:
+                        first[(name, method)] = queries
+                    elif queries != first[(name, method)]:
+                        failures.append(f"{label}: {first[(name, method)]} -> {queries} queries as rows grow")
+                        self.stdout.write(self.style.ERROR(f"    scales with rows: {first[(name, method)]} -> {queries} queries"))
+                        self.print_sql(sql, only_repeated=True)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Writes"))
+            for name, method, budget_queries, budget_ms, build in WRITES:
+                path, kwargs = build(ctx)
+                queries, ms, status, sql, response = self.measure(client, method, path, kwargs, 1)
+                failures += self.check_budget(f"{method} {name}", budget_queries, budget_ms, queries, ms, status, sql, options)
+                if (name, method) in REMEMBER and status < 400:
+                    ctx[REMEMBER[(name, method)]] = response.json()["id"]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Tag lists (1 and {TAG_COUNT} new tags)"))
+            for name, method, build in TAG_WRITES:
+                counts = []
+                for count in (1, TAG_COUNT):
+                    tags = [f"{ctx['prefix']}-{name}-{count}-{i}" for i in range(count)]
+                    path, kwargs = build(ctx, tags)
+                    queries, ms, status, sql, _ = self.measure(client, method, path, kwargs, 1)
+                    if status >= 400:
+                        failures.append(f"{method} {name} with {count} tags: status {status}")
+                    counts.append(queries)
+                line = f"{method} {name:<38} {counts[0]:>3} -> {counts[1]:>3} queries"
+                if counts[0] != counts[1]:
+                    failures.append(f"{method} {name}: {counts[0]} -> {counts[1]} queries with {TAG_COUNT} tags")
+                    self.stdout.write(self.style.ERROR(f"{line}  FAIL: scales with tags"))
+                    self.print_sql(sql, only_repeated=True)
+                else:
+                    self.stdout.write(line)
+
+            # Leaves a --keepdb database empty for the next run
+            transaction.set_rollback(True)
+        return failures
@@ -0,0 +1,84 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from assets.models import Asset, AssetVersion, Category, Tag, User
+from assets.views import AssetFilter
+
+# "Seq Scan on x" (PostgreSQL) or "SCAN x" without an index (SQLite)
+FULL_SCAN = re.compile(r"Seq Scan on (\w+)|\bSCAN (\w+)(?!.*\bUSING\b)")
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every AssetFilter filter and the version lookups, report "
+        "whether each one is served by an index, and time it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Timed executions per query.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plans.")
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error if any query falls back to a full table scan.",
+        )
+
+    def get_queries(self):
+        user = User.objects.order_by("pk").first()
+        category = Category.objects.order_by("pk").first()
+        tag = Tag.objects.order_by("pk").first()
+        asset = Asset.objects.order_by("pk").first()
+
+        def filtered(params):
+            return AssetFilter(params, queryset=Asset.objects.all()).qs
+
+        return [
+            ("filter uploaded_by", filtered({"uploaded_by": user.pk if user else 0})),
+            ("filter category", filtered({"category": category.pk if category else 0})),
+            ("filter tags", filtered({"tags": tag.name if tag else "x"})),
+            ("filter date_from", filtered({"date_from": "2024-01-01"})),
+            ("filter date_to", filtered({"date_to": "2024-01-01"})),
+            ("filter mime_type", filtered({"mime_type": "image/jpeg"})),
+            ("filter min_width", filtered({"min_width": 1920})),
+            ("filter max_size", filtered({"max_size": 1024})),
+            ("versions by asset", AssetVersion.objects.filter(asset_id=asset.pk if asset else 0).order_by("-version", "-uploaded_at")),
+            ("latest approved version", AssetVersion.objects.filter(asset_id=asset.pk if asset else 0, status="approved").order_by("-version")[:1]),
+            ("pending versions", AssetVersion.objects.filter(status="pending").order_by("-uploaded_at")),
+        ]
+
+    def explain(self, queryset):
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Small tables make the planner prefer seq scans; this asks
+                # whether an index *can* serve the query.
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+
+    def handle(self, *args, **options):
+        scans = []
+        for label, queryset in self.get_queries():
+            plan = self.explain(queryset)
+            tables = sorted({a or b for a, b in FULL_SCAN.findall(plan)})
+
+            timings = []
+            for _ in range(max(options["repeat"], 1)):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            best = min(timings)
+
+            if tables:
+                scans.append(label)
+                status = self.style.WARNING(f"SCAN ({', '.join(tables)})")
+            else:
+                status = self.style.SUCCESS("INDEX")
+            self.stdout.write(f"{label:<26} {status:<30} best {best:.2f} ms")
+            if options["verbose_plans"]:
+                self.stdout.write(plan + "\n")
+
+        if scans and options["fail_on_scan"]:
+            raise CommandError(f"Full table scans in: {', '.join(scans)}")
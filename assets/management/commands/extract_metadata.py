@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from assets.metadata import apply_technical_metadata
+from assets.models import Asset
+
+
+class Command(BaseCommand):
+    help = "Extract technical metadata (type, size, hash, dimensions...) for existing assets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing-only", action="store_true", help="Skip assets that already have technical metadata.")
+
+    def handle(self, *args, **options):
+        assets = Asset.objects.order_by("pk")
+        if options["missing_only"]:
+            assets = assets.exclude(metadata__has_key="technical")
+
+        updated = 0
+        for asset_id in assets.values_list("pk", flat=True).iterator():
+            if apply_technical_metadata(asset_id) is not None:
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Extracted metadata for {updated} asset(s)."))
@@ -0,0 +1,51 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from assets.storage import BLOB_PREFIX, blob_reference_counts, content_addressed_storage
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed blobs that no asset or version references any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Keep unreferenced blobs newer than this; their upload may still be in flight.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+
+    def iter_blobs(self, storage):
+        root = storage.path(BLOB_PREFIX)
+        for dirpath, dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, storage.location).replace(os.sep, "/"), path
+
+    def handle(self, *args, **options):
+        storage = content_addressed_storage
+        references = blob_reference_counts()
+        cutoff = time.time() - options["grace_hours"] * 3600
+
+        kept = deleted = reclaimed = 0
+        for name, path in self.iter_blobs(storage):
+            # Anything a row points at is kept, whether or not BLOB_NAME matches it
+            if references[name] or os.path.getmtime(path) > cutoff:
+                kept += 1
+                continue
+            # Unreferenced blobs and stale temp files from interrupted uploads
+            reclaimed += os.path.getsize(path)
+            deleted += 1
+            if options["dry_run"]:
+                self.stdout.write(f"would delete {name}")
+            else:
+                os.remove(path)
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {deleted} blob(s), {reclaimed} bytes; kept {kept}. "
+            f"{sum(references.values())} reference(s) to {len(references)} blob(s)."
+        ))
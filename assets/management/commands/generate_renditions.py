@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from assets.models import AssetVersion
+from assets.renditions import generate_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate missing thumbnails/previews for existing asset versions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate renditions that already exist.")
+        parser.add_argument("--approved-only", action="store_true", help="Skip pending and rejected versions.")
+
+    def handle(self, *args, **options):
+        versions = AssetVersion.objects.order_by("pk")
+        if options["approved_only"]:
+            versions = versions.filter(status="approved")
+
+        created = 0
+        for version_id in versions.values_list("pk", flat=True).iterator():
+            created += len(generate_renditions(version_id, force=options["force"]))
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} rendition(s)."))
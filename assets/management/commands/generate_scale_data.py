@@ -0,0 +1,194 @@
+import io
+import itertools
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from PIL import Image
+
+from assets.caching import invalidate_all_assets
+from assets.ingest import store_file
+from assets.models import Asset, AssetVersion, Category, Tag, User
+from assets.search import search_values
+from assets.stats import invalidate_stats
+
+WORDS = [
+    "summer", "campaign", "logo", "banner", "product", "launch", "portrait", "office", "team", "event",
+    "brochure", "poster", "social", "video", "interview", "studio", "outdoor", "winter", "sale", "press",
+    "report", "annual", "brand", "guide", "icon", "hero", "header", "footer", "print", "web",
+]
+STATUS_WEIGHTS = (("approved", 85), ("pending", 10), ("rejected", 5))
+TAGS_PER_ASSET = (0, 1, 2, 3, 4, 5, 6, 8)
+TAGS_PER_ASSET_WEIGHTS = (5, 15, 25, 25, 15, 8, 5, 2)
+ROLE_WEIGHTS = (("admin", 5), ("editor", 25), ("viewer", 70))
+
+
+def placeholder_files():
+    """Store one tiny file per media type; every synthetic row points at one of them."""
+    png = io.BytesIO()
+    Image.new("RGB", (8, 8), (200, 80, 40)).save(png, "PNG")
+    pdf = b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+    return [
+        # (mime type, stored name, weight)
+        ("image/png", store_file(ContentFile(png.getvalue()), "synthetic.png"), 60),
+        ("application/pdf", store_file(ContentFile(pdf), "synthetic.pdf"), 25),
+        ("text/plain", store_file(ContentFile(b"synthetic placeholder\n"), "synthetic.txt"), 15),
+    ]
+
+
+def zipf_weights(count, exponent):
+    """Cumulative weights so a few tags are on most assets and most tags are rare."""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a seeded synthetic library (users, categories, skewed tags, "
+        "assets with version histories) with bulk_create, for scale testing. "
+        "The same --seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=1_000_000)
+        parser.add_argument("--versions", type=int, default=5_000_000, help="Approximate total versions (at least one per asset).")
+        parser.add_argument("--tags", type=int, default=5_000)
+        parser.add_argument("--tag-skew", type=float, default=1.1, help="Zipf exponent of the tag popularity.")
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--prefix", default="synthetic", help="Prefix for generated user, category and tag names.")
+
+    # -------------------- Shared rows --------------------
+    def create_named(self, model, names, **fields):
+        model.objects.bulk_create([model(name=n, **fields) for n in names], ignore_conflicts=True)
+        by_name = model.objects.in_bulk(names, field_name="name")
+        return [by_name[n] for n in names]
+
+    def create_users(self, rng, prefix, count):
+        password = make_password(None)  # unusable; benchmarks authenticate with tokens
+        roles, weights = zip(*ROLE_WEIGHTS)
+        names = [f"{prefix}-user-{i}" for i in range(count)]
+        User.objects.bulk_create(
+            [User(username=n, password=password, role=r) for n, r in zip(names, rng.choices(roles, weights, k=count))],
+            ignore_conflicts=True,
+        )
+        return list(User.objects.filter(username__in=names).order_by("pk"))
+
+    # -------------------- Assets --------------------
+    def create_batch(self, rng, start, count, ctx):
+        Through = Asset.tags.through
+        VersionThrough = AssetVersion.tags.through
+        statuses, status_weights = zip(*STATUS_WEIGHTS)
+        extra_versions = ctx["mean_versions"] - 1
+
+        assets, plans = [], []
+        for i in range(start, start + count):
+            mime, file_name, _ = rng.choices(ctx["files"], ctx["file_weights"])[0]
+            words = rng.sample(WORDS, 3)
+            n_tags = rng.choices(TAGS_PER_ASSET, TAGS_PER_ASSET_WEIGHTS)[0]
+            tags = list(dict.fromkeys(rng.choices(ctx["tags"], cum_weights=ctx["tag_weights"], k=n_tags)))
+            n_versions = 1 + (round(rng.expovariate(1 / extra_versions)) if extra_versions > 0 else 0)
+            # Version 1 is the approved original; later ones may be pending or rejected
+            version_statuses = ["approved"] + rng.choices(statuses, status_weights, k=n_versions - 1)
+            current = max(n for n, s in enumerate(version_statuses, 1) if s == "approved")
+            asset = Asset(
+                title=" ".join(words).capitalize() + f" {i}",
+                description=f"{words[0]} {rng.choice(WORDS)} for {rng.choice(WORDS)}",
+                file=file_name,
+                uploaded_by=rng.choice(ctx["uploaders"]),
+                category=rng.choice(ctx["categories"]) if rng.random() < 0.9 else None,
+                version=current,
+                metadata={
+                    "client": f"client{rng.randrange(500)}",
+                    "project": f"P{rng.randrange(20_000)}",
+                    "technical": {
+                        "mime_type": mime,
+                        "width": rng.randrange(320, 8000) if mime == "image/png" else None,
+                        "height": rng.randrange(240, 4560) if mime == "image/png" else None,
+                        "size_bytes": int(rng.lognormvariate(13, 1.5)),
+                    },
+                },
+            )
+            search = search_values(asset, [t.name for t in tags])
+            asset.search_document = search["search_document"]
+            assets.append(asset)
+            plans.append((tags, version_statuses, current, search.get("search_vector")))
+
+        Asset.objects.bulk_create(assets)
+        Through.objects.bulk_create([Through(asset_id=a.pk, tag_id=t.pk) for a, (tags, *_) in zip(assets, plans) for t in tags])
+
+        versions, current_versions = [], []
+        for asset, (tags, version_statuses, current, vector) in zip(assets, plans):
+            for number, status in enumerate(version_statuses, 1):
+                version = AssetVersion(
+                    asset=asset,
+                    file=asset.file.name,
+                    uploaded_by=asset.uploaded_by if number == 1 else rng.choice(ctx["uploaders"]),
+                    version=number,
+                    status=status,
+                    title=asset.title,
+                    description=asset.description,
+                    category=asset.category,
+                )
+                versions.append(version)
+                if number == current:
+                    asset.current_version = version
+                    current_versions.append((version, tags))
+            # The tsvector expression (PostgreSQL only) is written with current_version below
+            if vector is not None:
+                asset.search_vector = vector
+        AssetVersion.objects.bulk_create(versions)
+        VersionThrough.objects.bulk_create([
+            VersionThrough(assetversion_id=v.pk, tag_id=t.pk) for v, tags in current_versions for t in tags
+        ])
+
+        fields = ["current_version", "search_vector"] if connection.vendor == "postgresql" else ["current_version"]
+        Asset.objects.bulk_update(assets, fields, batch_size=1_000)
+        return len(versions)
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError(f"{connection.vendor} does not return ids from bulk inserts; use PostgreSQL (or SQLite 3.35+).")
+        if options["assets"] < 1 or options["tags"] < 1 or options["categories"] < 1 or options["users"] < 1:
+            raise CommandError("--assets, --tags, --categories and --users must be positive.")
+
+        rng = random.Random(options["seed"])
+        prefix = options["prefix"]
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.create_users(rng, prefix, options["users"])
+            categories = self.create_named(Category, [f"{prefix} category {i}" for i in range(options["categories"])])
+            tags = self.create_named(Tag, [f"{prefix}-{WORDS[i % len(WORDS)]}-{i}" for i in range(options["tags"])])
+            files = placeholder_files()
+        self.stdout.write(f"{len(users)} users, {len(categories)} categories, {len(tags)} tags")
+
+        ctx = {
+            "uploaders": [u for u in users if u.role in ("admin", "editor")] or users,
+            "categories": categories,
+            "tags": tags,
+            "tag_weights": zipf_weights(len(tags), options["tag_skew"]),
+            "files": files,
+            "file_weights": [weight for _, _, weight in files],
+            "mean_versions": max(options["versions"] / options["assets"], 1),
+        }
+
+        total, versions, batch_size = options["assets"], 0, options["batch_size"]
+        for start in range(0, total, batch_size):
+            with transaction.atomic():
+                versions += self.create_batch(rng, start, min(batch_size, total - start), ctx)
+            done = min(start + batch_size, total)
+            self.stdout.write(f"  {done}/{total} assets, {versions} versions ({time.perf_counter() - started:.0f} s)")
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        # bulk_create sends no signals
+        invalidate_stats()
+        invalidate_all_assets()
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total} assets and {versions} versions in {time.perf_counter() - started:.1f} s (seed {options['seed']})."
+        ))
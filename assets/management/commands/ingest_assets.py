@@ -0,0 +1,70 @@
+import json
+import os
+from contextlib import ExitStack
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from assets.ingest import ingest_assets, manifest_item
+from assets.models import User
+
+
+class Command(BaseCommand):
+    help = "Bulk-ingest every file under a local directory as approved assets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory to ingest.")
+        parser.add_argument("--username", required=True, help="User recorded as the uploader.")
+        parser.add_argument("--tags", default="", help="Comma separated tags applied to every file.")
+        parser.add_argument("--category-id", type=int, help="Category applied to every file.")
+        parser.add_argument(
+            "--manifest",
+            help='JSON list of {"filename", "title", "description", "tags", "category_id", '
+                 '"metadata"} records, filename relative to the directory.',
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Files per transaction.")
+        parser.add_argument("--no-recursive", action="store_true", help="Skip subdirectories.")
+
+    def iter_paths(self, directory, recursive):
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                yield os.path.join(root, name)
+            if not recursive:
+                break
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        if not os.path.isdir(directory):
+            raise CommandError(f"{directory} is not a directory")
+
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user {options['username']}")
+
+        entries = {}
+        if options["manifest"]:
+            with open(options["manifest"]) as fh:
+                entries = {e["filename"]: e for e in json.load(fh)}
+
+        paths = list(self.iter_paths(directory, not options["no_recursive"]))
+        batch_size = max(options["batch_size"], 1)
+        total = 0
+
+        for start in range(0, len(paths), batch_size):
+            with ExitStack() as stack:
+                items = []
+                for path in paths[start:start + batch_size]:
+                    relpath = os.path.relpath(path, directory)
+                    fh = stack.enter_context(open(path, "rb"))
+                    items.append(manifest_item(
+                        File(fh, name=os.path.basename(path)),
+                        entries.get(relpath),
+                        tags=options["tags"],
+                        category_id=options["category_id"],
+                    ))
+                total += len(ingest_assets(items, user))
+            self.stdout.write(f"Ingested {total}/{len(paths)} file(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Created {total} asset(s)."))
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from assets.models import UploadSession
+from assets.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = "Discard chunked upload sessions that were never completed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-hours", type=float, default=72, help="Age of abandoned sessions.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["older_than_hours"])
+        stale = UploadSession.objects.filter(status="active", created_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            discard_upload(session)
+            session.delete()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Discarded {count} upload session(s)."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from assets.models import Asset
+from assets.search import reindex_assets
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search document and vector for every asset."
+
+    def handle(self, *args, **options):
+        count = 0
+        batch = []
+        # The search text is not part of any representation: leave
+        # updated_at (and with it every cached body and ETag) alone
+        for pk in Asset.objects.order_by("pk").values_list("pk", flat=True).iterator(chunk_size=BATCH_SIZE):
+            batch.append(pk)
+            if len(batch) == BATCH_SIZE:
+                count += reindex_assets(batch, batch_size=BATCH_SIZE, touch=False)
+                batch = []
+        if batch:
+            count += reindex_assets(batch, batch_size=BATCH_SIZE, touch=False)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {count} asset(s)."))
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Max
+
+from assets.models import Task
+from assets.taskqueue import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run background tasks from the database queue on a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=getattr(settings, "TASK_WORKER_PROCESSES", 2),
+            help="Pool size (tasks run in parallel).",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between queue polls.")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty.")
+        parser.add_argument("--stats", action="store_true", help="Print per-task timing and exit.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.print_stats()
+            return
+
+        self.stdout.write(f"Task worker started with {options['processes']} process(es)")
+        run_worker(
+            processes=max(options["processes"], 1),
+            poll_interval=options["poll_interval"],
+            lock_timeout=getattr(settings, "TASK_LOCK_TIMEOUT", 600),
+            once=options["once"],
+            stdout=self.stdout,
+        )
+
+    def print_stats(self):
+        rows = (
+            Task.objects.values("name", "status")
+            .annotate(count=Count("id"), avg_ms=Avg("duration_ms"), max_ms=Max("duration_ms"))
+            .order_by("name", "status")
+        )
+        self.stdout.write(f"{'task':<28}{'status':<10}{'count':>8}{'avg ms':>12}{'max ms':>12}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['name']:<28}{row['status']:<10}{row['count']:>8}"
+                f"{row['avg_ms'] or 0:>12.1f}{row['max_ms'] or 0:>12.1f}"
+            )
@@ -0,0 +1,352 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import struct
+
+from django.db import connection, transaction
+from django.db.models import Q
+from PIL import ExifTags, Image, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+from .models import METADATA_INDEXES, METADATA_TYPES, Asset, metadata_key
+from .search import update_search_index
+from .storage import blob_hash
+from .taskqueue import enqueue_many
+
+READ_SIZE = 1024 * 1024
+PDF_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+EXIF_FIELDS = ("Make", "Model", "DateTimeOriginal", "DateTime", "Orientation", "Software")
+
+META_PARAM = "meta."
+META_LOOKUPS = {"exact", "in", "gt", "gte", "lt", "lte", "icontains"}
+# dotted segments; "__" is reserved for the lookup suffix
+META_PATH = re.compile(r"^[A-Za-z0-9-]+(?:_[A-Za-z0-9-]+)*(?:\.[A-Za-z0-9-]+(?:_[A-Za-z0-9-]+)*)*$")
+
+mimetypes.add_type("model/gltf-binary", ".glb")
+mimetypes.add_type("model/gltf+json", ".gltf")
+
+
+# ---------------------------------------------------------------------
+# FORMAT SNIFFING
+# ---------------------------------------------------------------------
+def sniff_mime(head, name):
+    """Guess the MIME type from the first bytes, falling back to the file name."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"%PDF"):
+        return "application/pdf"
+    if head.startswith(b"glTF"):
+        return "model/gltf-binary"
+    if head[4:8] == b"ftyp":
+        return "video/quicktime" if head[8:10] == b"qt" else "video/mp4"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "video/webm"
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+# ---------------------------------------------------------------------
+# PER-FORMAT READERS (seek to headers, never read the whole file)
+# ---------------------------------------------------------------------
+def image_info(fh):
+    fh.seek(0)
+    try:
+        image = Image.open(fh)  # lazy: parses the header only
+    except (UnidentifiedImageError, OSError):
+        return {}
+    info = {"width": image.width, "height": image.height, "color_mode": image.mode}
+    try:
+        exif = image.getexif()
+    except Exception:
+        exif = {}
+    if exif:
+        named = {ExifTags.TAGS.get(k, k): v for k, v in exif.items()}
+        picked = {k: str(named[k]) for k in EXIF_FIELDS if k in named}
+        if picked:
+            info["exif"] = picked
+    return info
+
+
+def _boxes(fh, start, end):
+    """Yield (type, payload_offset, payload_end) for ISO-BMFF boxes in [start, end)."""
+    offset = start
+    while offset + 8 <= end:
+        fh.seek(offset)
+        header = fh.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack(">I4s", header)
+        payload = offset + 8
+        if size == 1:
+            size = struct.unpack(">Q", fh.read(8))[0]
+            payload += 8
+        elif size == 0:
+            size = end - offset
+        if size < 8:
+            return
+        yield kind, payload, offset + size
+        offset += size
+
+
+def mp4_info(fh, size):
+    """Duration from the moov/mvhd box of an MP4/MOV file."""
+    for kind, start, end in _boxes(fh, 0, size):
+        if kind != b"moov":
+            continue
+        for child, child_start, _ in _boxes(fh, start, end):
+            if child != b"mvhd":
+                continue
+            fh.seek(child_start)
+            version = fh.read(1)[0]
+            fh.seek(child_start + (20 if version == 1 else 12))
+            if version == 1:
+                timescale, duration = struct.unpack(">IQ", fh.read(12))
+            else:
+                timescale, duration = struct.unpack(">II", fh.read(8))
+            if timescale:
+                return {"duration_seconds": round(duration / timescale, 3)}
+    return {}
+
+
+def gltf_stats(doc):
+    accessors = doc.get("accessors", [])
+    vertices = triangles = primitives = 0
+    for mesh in doc.get("meshes", []):
+        for prim in mesh.get("primitives", []):
+            primitives += 1
+            position = prim.get("attributes", {}).get("POSITION")
+            count = accessors[position].get("count", 0) if position is not None and position < len(accessors) else 0
+            vertices += count
+            if prim.get("mode", 4) == 4:  # TRIANGLES
+                indices = prim.get("indices")
+                if indices is not None and indices < len(accessors):
+                    count = accessors[indices].get("count", 0)
+                triangles += count // 3
+    return {
+        "meshes": len(doc.get("meshes", [])),
+        "primitives": primitives,
+        "vertices": vertices,
+        "triangles": triangles,
+        "nodes": len(doc.get("nodes", [])),
+        "materials": len(doc.get("materials", [])),
+        "textures": len(doc.get("textures", [])),
+        "animations": len(doc.get("animations", [])),
+    }
+
+
+def glb_info(fh):
+    """Read only the GLB header and its JSON chunk; binary buffers are skipped."""
+    fh.seek(0)
+    header = fh.read(20)
+    if len(header) < 20 or header[:4] != b"glTF":
+        return {}
+    _, version, _, chunk_length, chunk_type = struct.unpack("<4sIIII", header)
+    if chunk_type != 0x4E4F534A:  # "JSON"
+        return {}
+    try:
+        doc = json.loads(fh.read(chunk_length))
+    except ValueError:
+        return {}
+    return {"gltf_version": version, **gltf_stats(doc)}
+
+
+# ---------------------------------------------------------------------
+# EXTRACTION
+# ---------------------------------------------------------------------
+def extract_technical_metadata(fieldfile):
+    """
+    Return MIME type, byte size, SHA-256 and format-specific details for a
+    stored file. The file is read sequentially at most once (for the hash
+    when it is not encoded in the blob name, and for PDF page counting);
+    other formats only seek to their headers.
+    """
+    name = fieldfile.name
+    with fieldfile.storage.open(name, "rb") as fh:
+        head = fh.read(32)
+        mime = sniff_mime(head, name)
+        size = fieldfile.storage.size(name)
+        info = {"mime_type": mime, "size_bytes": size}
+
+        sha = blob_hash(name)
+        is_pdf = mime == "application/pdf"
+        if sha is None or is_pdf:
+            digest = hashlib.sha256() if sha is None else None
+            pages, tail = 0, b""
+            fh.seek(0)
+            for chunk in iter(lambda: fh.read(READ_SIZE), b""):
+                if digest is not None:
+                    digest.update(chunk)
+                if is_pdf:
+                    window = tail + chunk
+                    pages += len(PDF_PAGE.findall(window)) - len(PDF_PAGE.findall(tail))
+                    tail = window[-32:]
+            if digest is not None:
+                sha = digest.hexdigest()
+            if is_pdf:
+                info["page_count"] = pages
+        info["sha256"] = sha
+
+        ext = os.path.splitext(name)[1].lower()
+        if mime.startswith("image/"):
+            info.update(image_info(fh))
+        elif mime in ("video/mp4", "video/quicktime"):
+            info.update(mp4_info(fh, size))
+        elif mime == "model/gltf-binary":
+            info.update(glb_info(fh))
+        elif ext == ".gltf":
+            fh.seek(0)
+            try:
+                info.update(gltf_stats(json.load(fh)))
+            except ValueError:
+                pass
+    return info
+
+
+# ---------------------------------------------------------------------
+# CLIENT-WRITTEN METADATA
+# ---------------------------------------------------------------------
+# Keys only the server writes. "technical" feeds the integer expression
+# indexes and /api/stats/, so a client value like "1920px" must never
+# reach it.
+SERVER_METADATA_KEYS = ("technical",)
+
+
+def client_metadata(value):
+    """Client-supplied metadata without the server-owned keys (None stays None)."""
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise ValidationError({"metadata": "Must be a JSON object."})
+    return {k: v for k, v in value.items() if k not in SERVER_METADATA_KEYS}
+
+
+def merge_metadata(current, incoming, partial=True):
+    """
+    Apply client metadata to an asset's stored metadata. Partial updates
+    merge top-level keys (null removes a key); full updates replace the
+    client keys. Server-owned keys are kept either way.
+    """
+    current = current if isinstance(current, dict) else {}
+    incoming = client_metadata(incoming) or {}
+    if partial:
+        merged = {**current, **incoming}
+    else:
+        merged = {**incoming, **{k: current[k] for k in SERVER_METADATA_KEYS if k in current}}
+    return {k: v for k, v in merged.items() if v is not None}
+
+
+def apply_technical_metadata(asset_id):
+    """Extract metadata for an asset's current file into metadata["technical"]."""
+    asset = Asset.objects.filter(pk=asset_id).first()
+    if asset is None or not asset.file:
+        return None
+    technical = extract_technical_metadata(asset.file)
+
+    with transaction.atomic():
+        # Re-read under lock so concurrent user edits to other keys survive
+        asset = Asset.objects.select_for_update().get(pk=asset_id)
+        metadata = asset.metadata if isinstance(asset.metadata, dict) else {}
+        metadata["technical"] = technical
+        asset.metadata = metadata
+        asset.save(update_fields=["metadata"])
+        update_search_index(asset)
+    return technical
+
+
+def schedule_metadata_extraction(*assets):
+    """Queue extraction; the key skips files that were already processed."""
+    enqueue_many(
+        "metadata.extract",
+        [((asset.pk,), f"metadata:{asset.pk}:{asset.file.name}") for asset in assets],
+    )
+
+
+# ---------------------------------------------------------------------
+# QUERYING (?meta.<path>[__<lookup>]=<value>)
+# ---------------------------------------------------------------------
+def _typed(raw, kind):
+    """Convert a query string value for a registered key, or guess its type."""
+    if kind == "text":
+        return raw
+    if kind in ("int", "bigint"):
+        return int(raw)
+    if kind == "float":
+        return float(raw)
+    for convert in (int, float):
+        try:
+            return convert(raw)
+        except ValueError:
+            pass
+    return {"true": True, "false": False}.get(raw, raw)
+
+
+def _nested(path, value):
+    for segment in reversed(path.split(".")):
+        value = {segment: value}
+    return value
+
+
+def _match(path, raw):
+    """
+    Equality on an unregistered key, served by the GIN index where supported.
+    "1920" matches both the number 1920 and the string "1920".
+    """
+    value = _typed(raw, None)
+    candidates = [value] if value == raw else [value, raw]
+    condition = Q()
+    for candidate in candidates:
+        if connection.features.supports_json_field_contains:
+            condition |= Q(metadata__contains=_nested(path, candidate))
+        else:
+            condition |= Q(**{"__".join(["metadata", *path.split("."), "exact"]): candidate})
+    return condition
+
+
+def filter_metadata(queryset, path, lookup, raw):
+    """Apply one typed metadata filter; raises ValidationError on bad input."""
+    param = f"{META_PARAM}{path}" + ("" if lookup == "exact" else f"__{lookup}")
+    if not META_PATH.match(path) or lookup not in META_LOOKUPS:
+        raise ValidationError({param: ["Unsupported metadata filter."]})
+
+    kind = METADATA_INDEXES[path][0] if path in METADATA_INDEXES else None
+    raws = [v.strip() for v in str(raw).split(",")] if lookup == "in" else [str(raw)]
+    try:
+        values = [raw if lookup == "icontains" else _typed(raw, kind) for raw in raws]
+    except ValueError:
+        raise ValidationError({param: ["Expected a number." if kind == "float" else "Expected an integer."]})
+
+    if kind is not None:
+        # Registered key: compare against the indexed expression
+        alias = "_meta_" + re.sub(r"\W", "_", path)
+        value = values if lookup == "in" else values[0]
+        return queryset.alias(**{alias: metadata_key(path, METADATA_TYPES[kind]())}).filter(
+            **{f"{alias}__{lookup}": value}
+        )
+
+    if lookup in ("exact", "in"):
+        condition = Q()
+        for raw in raws:
+            condition |= _match(path, raw)
+        return queryset.filter(condition)
+    return queryset.filter(**{"__".join(["metadata", *path.split("."), lookup]): values[0]})
+
+
+def filter_metadata_params(queryset, params):
+    """Apply every ?meta.* query parameter in `params` (a QueryDict or dict)."""
+    for param in params:
+        if not param.startswith(META_PARAM):
+            continue
+        path, sep, lookup = param[len(META_PARAM):].rpartition("__")
+        if not sep:
+            path, lookup = lookup, "exact"
+        values = params.getlist(param) if hasattr(params, "getlist") else [params[param]]
+        for raw in values:
+            queryset = filter_metadata(queryset, path, lookup, raw)
+    return queryset
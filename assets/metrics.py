@@ -0,0 +1,258 @@
+"""Per-endpoint request metrics: latency, SQL, serializer time and bytes.
+
+RequestMetricsMiddleware records every request into an in-process
+registry served as Prometheus text by metrics_view (one registry per
+worker process; scrape each worker or sum them in the query). With
+METRICS_SLOW_REQUEST_MS set, requests slower than that are logged to the
+"assets.metrics" logger with their slowest and most repeated statements.
+"""
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SLOW_TRACE_STATEMENTS = 5
+
+_current = ContextVar("request_metrics", default=None)
+
+
+# ---------------------------------------------------------------------
+# PER-REQUEST RECORD
+# ---------------------------------------------------------------------
+class RequestRecord:
+    """
+    Totals for the request in progress. Installed as a database execute
+    wrapper, so every query (ORM or raw cursor) is counted and timed.
+    """
+    __slots__ = ("queries", "sql_seconds", "serializer_seconds", "serializer_depth", "statements")
+
+    def __init__(self, keep_sql=False):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+        # (seconds, sql) pairs, only kept when slow traces are enabled
+        self.statements = [] if keep_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.sql_seconds += elapsed
+            if self.statements is not None:
+                self.statements.append((elapsed, sql))
+
+
+def timed_representation(func):
+    """
+    Add the outermost to_representation() call's time to the current
+    request's serializer time; nested serializers are part of it.
+    """
+    @functools.wraps(func)
+    def wrapper(self, instance):
+        record = _current.get()
+        if record is None or record.serializer_depth:
+            return func(self, instance)
+        record.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(self, instance)
+        finally:
+            record.serializer_seconds += time.perf_counter() - start
+            record.serializer_depth -= 1
+    return wrapper
+
+
+class TimedSerializerMixin:
+    """
+    Time serialization for the request metrics. Subclasses that override
+    to_representation are wrapped too, so their own work is included.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "to_representation" in cls.__dict__:
+            cls.to_representation = timed_representation(cls.__dict__["to_representation"])
+
+    @timed_representation
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+# ---------------------------------------------------------------------
+# REGISTRY
+# ---------------------------------------------------------------------
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+        yield "+Inf", self.count
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Per-route counters and histograms, safe to update from several threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()  # (method, route, status) -> count
+            self.latency = {}  # (method, route) -> Histogram (seconds)
+            self.queries = {}  # (method, route) -> Histogram (query count)
+            self.sql_seconds = Counter()
+            self.serializer_seconds = Counter()
+            self.response_bytes = Counter()
+
+    def observe(self, method, route, status, seconds, record, nbytes):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.queries[key] = Histogram(QUERY_BUCKETS)
+            self.latency[key].observe(seconds)
+            self.queries[key].observe(record.queries)
+            self.sql_seconds[key] += record.sql_seconds
+            self.serializer_seconds[key] += record.serializer_seconds
+            self.response_bytes[key] += nbytes
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP dam_http_requests_total Requests by route, method and status code.",
+                "# TYPE dam_http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"dam_http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+            for name, help_text, histograms in (
+                ("dam_http_request_duration_seconds", "Time spent producing the response.", self.latency),
+                ("dam_http_request_queries", "SQL queries per request.", self.queries),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    labels = _labels(method=method, route=route)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            for name, help_text, counter in (
+                ("dam_http_request_sql_seconds_total", "Time spent executing SQL.", self.sql_seconds),
+                ("dam_http_request_serializer_seconds_total", "Time spent in serializers (includes their SQL).", self.serializer_seconds),
+                ("dam_http_response_bytes_total", "Response body bytes (streamed bodies only when Content-Length is set).", self.response_bytes),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), value in sorted(counter.items()):
+                    lines.append(f"{name}{{{_labels(method=method, route=route)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ---------------------------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------------------------
+def route_name(request):
+    """The URL pattern name (e.g. "assets-detail"), never the raw path."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unmatched>"
+    return match.view_name or match.route
+
+
+def response_bytes(response):
+    if response.has_header("Content-Length"):
+        return int(response["Content-Length"])
+    return 0 if response.streaming else len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, SQL count/time, serializer time and response size per
+    route. Latency ends when the response is returned, before a streamed
+    body is sent. Disabled with METRICS_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "METRICS_SLOW_REQUEST_MS", None)
+
+    def __call__(self, request):
+        record = RequestRecord(keep_sql=self.slow_ms is not None)
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(record))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+
+        route = route_name(request)
+        registry.observe(request.method, route, response.status_code, elapsed, record, response_bytes(response))
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            log_slow_request(request, route, response.status_code, elapsed, record)
+        return response
+
+
+def log_slow_request(request, route, status, elapsed, record):
+    slowest = sorted(record.statements, key=lambda s: s[0], reverse=True)[:SLOW_TRACE_STATEMENTS]
+    repeated = [(n, sql) for sql, n in Counter(sql for _, sql in record.statements).most_common(SLOW_TRACE_STATEMENTS) if n > 1]
+    lines = [f"  {seconds * 1000:.1f}ms {sql}" for seconds, sql in slowest]
+    if repeated:
+        lines.append("  repeated:")
+        lines += [f"  {n}x {sql}" for n, sql in repeated]
+    logger.warning(
+        "Slow request %s %s (%s) status=%s %.0fms queries=%d sql=%.0fms serializer=%.0fms\n%s",
+        request.method, request.get_full_path(), route, status, elapsed * 1000,
+        record.queries, record.sql_seconds * 1000, record.serializer_seconds * 1000, "\n".join(lines),
+    )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0008_asset_created_by'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='current_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='assets.assetversion'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:23
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+# GIN indexes are PostgreSQL-only; other backends use the plain-text fallback.
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS assets_asset_search_vector_gin "
+            "ON assets_asset USING gin (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS assets_asset_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0009_asset_current_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asset',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
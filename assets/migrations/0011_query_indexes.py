@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:25
+
+from django.db import migrations, models
+
+
+# AssetFilter.tags is an icontains lookup, which PostgreSQL renders as
+# UPPER(name::text) LIKE ...; only a trigram index on that expression helps.
+def create_tag_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS assets_tag_name_trgm "
+            "ON assets_tag USING gin (UPPER(name::text) gin_trgm_ops)"
+        )
+
+
+def drop_tag_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS assets_tag_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0010_asset_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['-uploaded_at', '-id'], name='asset_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['uploaded_by', '-uploaded_at'], name='asset_uploader_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['category', '-uploaded_at'], name='asset_category_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetversion',
+            index=models.Index(fields=['asset', 'status', '-version'], name='version_asset_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetversion',
+            index=models.Index(fields=['asset', '-version', '-uploaded_at'], name='version_asset_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetversion',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-uploaded_at'], name='version_pending_idx'),
+        ),
+        migrations.RunPython(create_tag_trigram_index, drop_tag_trigram_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:27
+
+import assets.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0011_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='asset',
+            name='file',
+            field=models.FileField(storage=assets.storage.asset_storage, upload_to='assets/'),
+        ),
+        migrations.AlterField(
+            model_name='assetversion',
+            name='file',
+            field=models.FileField(storage=assets.storage.asset_storage, upload_to='assets/versions/'),
+        ),
+    ]
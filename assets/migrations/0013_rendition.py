@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:29
+
+import assets.storage
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0012_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('thumbnail', 'Thumbnail'), ('preview', 'Web Preview'), ('poster', 'Poster Frame')], max_length=20)),
+                ('file', models.FileField(storage=assets.storage.asset_storage, upload_to='renditions/')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='assets.assetversion')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('version', 'kind'), name='unique_rendition_kind')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:35
+
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+# metadata["technical"] is server-owned from this release on. Values an
+# older client stored there that the integer casts cannot read ("1920px",
+# 1920.5) would fail the index build, so they are dropped first;
+# `manage.py extract_metadata` writes them again from the files.
+CASTABLE = {"width": r"^-?[0-9]{1,9}$", "height": r"^-?[0-9]{1,9}$", "size_bytes": r"^-?[0-9]{1,18}$"}
+
+
+def drop_uncastable_technical_values(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for key, pattern in CASTABLE.items():
+        schema_editor.execute(
+            "UPDATE assets_asset SET metadata = metadata #- %s::text[] "
+            "WHERE metadata->'technical'->>%s IS NOT NULL AND NOT (metadata->'technical'->>%s ~ %s)",
+            [f"{{technical,{key}}}", key, key, pattern],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0015_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_uncastable_technical_values, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('mime_type', django.db.models.fields.json.KeyTextTransform('technical', 'metadata')), models.TextField()), name='asset_meta_mime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('width', django.db.models.fields.json.KeyTextTransform('technical', 'metadata')), models.IntegerField()), name='asset_meta_width_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('height', django.db.models.fields.json.KeyTextTransform('technical', 'metadata')), models.IntegerField()), name='asset_meta_height_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('size_bytes', django.db.models.fields.json.KeyTextTransform('technical', 'metadata')), models.BigIntegerField()), name='asset_meta_size_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:37
+
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+# Equality on unregistered metadata keys is a jsonb containment (@>) test;
+# jsonb_path_ops is the smaller GIN opclass that supports exactly that.
+def create_metadata_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS assets_asset_metadata_gin "
+            "ON assets_asset USING gin (metadata jsonb_path_ops)"
+        )
+
+
+def drop_metadata_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS assets_asset_metadata_gin")
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0016_technical_metadata_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('client', 'metadata'), models.TextField()), name='asset_meta_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('project', 'metadata'), models.TextField()), name='asset_meta_project_idx'),
+        ),
+        migrations.RunPython(create_metadata_gin_index, drop_metadata_gin_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0017_metadata_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assetversion',
+            index=models.Index(fields=['status', '-uploaded_at'], name='version_status_uploaded_idx'),
+        ),
+    ]
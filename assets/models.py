@@ -1,6 +1,14 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager  # ✅ ADDED BaseUserManager
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
 from django.conf import settings
+from django.utils import timezone
+
+from .storage import asset_storage
 
 
 # ----------------------------------------------------------
@@ -70,13 +78,54 @@ class Tag(models.Model):
         return self.name
 
 
+# ----------------------------------------------------------
+# Indexed Asset.metadata keys
+# ----------------------------------------------------------
+# Dotted key path in Asset.metadata -> (value type, expression index name).
+# Registered keys are filtered through a typed expression index
+# (?meta.client=acme); any other key falls back to the GIN index on the
+# whole column. Adding an entry here needs a makemigrations run.
+METADATA_INDEXES = {
+    "technical.mime_type": ("text", "asset_meta_mime_idx"),
+    "technical.width": ("int", "asset_meta_width_idx"),
+    "technical.height": ("int", "asset_meta_height_idx"),
+    "technical.size_bytes": ("bigint", "asset_meta_size_idx"),
+    "client": ("text", "asset_meta_client_idx"),
+    "project": ("text", "asset_meta_project_idx"),
+}
+METADATA_TYPES = {
+    "text": models.TextField,
+    "int": models.IntegerField,
+    "bigint": models.BigIntegerField,
+    "float": models.FloatField,
+}
+
+
+def metadata_key(path, output_field=None):
+    """
+    Expression for a dotted Asset.metadata path, cast to a plain column
+    type so lookups compare values rather than JSON. The expression indexes
+    and the filters both build it here so the SQL matches exactly.
+    """
+    lookup = "__".join(["metadata", *path.split(".")])
+    return Cast(KT(lookup), output_field or models.TextField())
+
+
+def metadata_indexes():
+    return [
+        models.Index(metadata_key(path, METADATA_TYPES[kind]()), name=name)
+        for path, (kind, name) in METADATA_INDEXES.items()
+    ]
+
+
 # ----------------------------------------------------------
 # Asset Model
 # ----------------------------------------------------------
 class Asset(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to="assets/")
+    # Content-addressed: identical bytes share one blob (see assets.storage)
+    file = models.FileField(upload_to="assets/", storage=asset_storage)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     uploaded_by = models.ForeignKey(
@@ -110,17 +159,53 @@ class Asset(models.Model):
         on_delete=models.SET_NULL,
         related_name="children"
     )
+    # Denormalized pointer to the latest approved version so list views can
+    # read it with a join instead of one query per asset.
+    current_version = models.ForeignKey(
+        "AssetVersion",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+"
+    )
+    # Flattened title/description/tags/category/metadata text maintained by
+    # assets.search.update_search_index; search_vector is its weighted
+    # tsvector (PostgreSQL only, GIN indexed).
+    search_document = models.TextField(blank=True, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Change marker for cached representations (assets.caching); also
+    # bumped when a version, rendition or version tag of the asset changes.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-uploaded_at"]
+        indexes = [
+            models.Index(fields=["-uploaded_at", "-id"], name="asset_uploaded_idx"),
+            models.Index(fields=["uploaded_by", "-uploaded_at"], name="asset_uploader_uploaded_idx"),
+            models.Index(fields=["category", "-uploaded_at"], name="asset_category_uploaded_idx"),
+            *metadata_indexes(),
+        ]
 
     def __str__(self):
         return f"{self.title} (v{self.version})"
 
+    def save(self, *args, **kwargs):
+        # Partial saves must move the change marker too
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
     def latest_version(self):
         """Return the latest approved version for this asset."""
         return self.versions.filter(status="approved").order_by("-version").first()
 
+    def sync_current_version(self, save=True):
+        """Recompute the current_version pointer from the approved versions."""
+        self.current_version = self.latest_version()
+        if save:
+            self.save(update_fields=["current_version"])
+        return self.current_version
 
 
 # ----------------------------------------------------------
@@ -134,7 +219,7 @@ class AssetVersion(models.Model):
     )
 
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE, related_name="versions")
-    file = models.FileField(upload_to="assets/versions/")
+    file = models.FileField(upload_to="assets/versions/", storage=asset_storage)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     version = models.PositiveIntegerField()
@@ -155,6 +240,134 @@ class AssetVersion(models.Model):
 
     class Meta:
         ordering = ["-version"]
+        indexes = [
+            # latest_version(): asset + approved, highest version first
+            models.Index(fields=["asset", "status", "-version"], name="version_asset_status_idx"),
+            # AssetVersionViewSet: ?asset_id= ordered by -version, -uploaded_at
+            models.Index(fields=["asset", "-version", "-uploaded_at"], name="version_asset_order_idx"),
+            # Pending approval queue stays small, so index only those rows
+            models.Index(
+                fields=["-uploaded_at"],
+                condition=models.Q(status="pending"),
+                name="version_pending_idx",
+            ),
+            # Review queue for the other statuses (approved/rejected history)
+            models.Index(fields=["status", "-uploaded_at"], name="version_status_uploaded_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.title} (v{self.version}) - {self.status}"
+
+
+# ----------------------------------------------------------
+# Rendition Model (thumbnails / previews of a version)
+# ----------------------------------------------------------
+class Rendition(models.Model):
+    KIND_CHOICES = (
+        ("thumbnail", "Thumbnail"),
+        ("preview", "Web Preview"),
+        ("poster", "Poster Frame"),
+    )
+
+    version = models.ForeignKey(AssetVersion, on_delete=models.CASCADE, related_name="renditions")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    file = models.FileField(upload_to="renditions/", storage=asset_storage)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["version", "kind"], name="unique_rendition_kind"),
+        ]
+
+    def __str__(self):
+        return f"{self.version} {self.kind} ({self.width}x{self.height})"
+
+
+# ----------------------------------------------------------
+# Task Model (database-backed queue, see assets.taskqueue)
+# ----------------------------------------------------------
+class Task(models.Model):
+    STATUS_CHOICES = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=list, blank=True)
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    duration_ms = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="task_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name}{tuple(self.args)} [{self.status}]"
+
+
+# ----------------------------------------------------------
+# Chunked Upload Models (see assets.uploads)
+# ----------------------------------------------------------
+class UploadSession(models.Model):
+    STATUS_CHOICES = (
+        ("active", "Active"),
+        ("complete", "Complete"),
+        ("aborted", "Aborted"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="upload_sessions")
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    part_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    # Set when the upload becomes a new version of an existing asset
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, null=True, blank=True, related_name="upload_sessions")
+    # For the finished asset: title / description / category_id (or
+    # category, an id or name) / tags / comment / metadata (new assets only)
+    fields = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="active")
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def part_count(self):
+        return max(1, -(-self.size // self.part_size))
+
+    def part_length(self, number):
+        """Expected byte length of part `number` (1-based)."""
+        if number == self.part_count:
+            return self.size - (self.part_count - 1) * self.part_size
+        return self.part_size
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+class UploadPart(models.Model):
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name="parts")
+    number = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    uploaded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["number"]
+        constraints = [
+            models.UniqueConstraint(fields=["session", "number"], name="unique_upload_part"),
+        ]
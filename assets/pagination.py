@@ -0,0 +1,196 @@
+import base64
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ---------------------------------------------------------------------
+# APPROXIMATE COUNTS (?count=approx)
+# ---------------------------------------------------------------------
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate on PostgreSQL instead of running
+    COUNT(*); other databases get an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class ApproximateCountPaginator(DjangoPaginator):
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+# ---------------------------------------------------------------------
+# KEYSET PAGINATION
+# ---------------------------------------------------------------------
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over the queryset's ordering, with id as the
+    final tie-breaker. Each page is a WHERE on the last row's sort values
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size=None, with_count=False):
+        self.page_size = page_size or api_settings.PAGE_SIZE
+        self.with_count = with_count
+
+    # -------------------- ordering --------------------
+    def get_ordering(self, queryset):
+        ordering = [
+            o for o in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(o, str) and "__" not in o.lstrip("-")
+        ]
+        if not ordering:
+            ordering = ["-pk"]
+        if ordering[-1].lstrip("-") not in ("pk", "id"):
+            ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+        return ordering
+
+    @staticmethod
+    def _reverse(ordering):
+        return [o[1:] if o.startswith("-") else f"-{o}" for o in ordering]
+
+    def _seek(self, ordering, values):
+        """Rows strictly after `values` in `ordering`."""
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip("-")
+            op = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{op}": values[i]})
+            for prev, value in zip(ordering[:i], values[:i]):
+                step &= Q(**{prev.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def _field(self, name):
+        name = name.lstrip("-")
+        return self.model._meta.pk if name == "pk" else self.model._meta.get_field(name)
+
+    def _values(self, obj):
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return values
+
+    # -------------------- cursor encoding --------------------
+    def encode_cursor(self, direction, values):
+        raw = json.dumps({"d": direction, "v": values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return "n", None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            direction, values = data["d"], data["v"]
+            if direction not in ("n", "p") or not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(encoded)
+            # Cursors come from the client: parse each value as its field would
+            values = [self._field(name).to_python(value) for name, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return direction, values
+
+    # -------------------- pagination --------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        self.count = estimate_count(queryset) if self.with_count else None
+        direction, position = self.decode_cursor(request)
+
+        ordering = self.ordering if direction == "n" else self._reverse(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if direction == "n":
+            self.has_next, self.has_previous = has_more, position is not None
+        else:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor("n", self._values(self.page[-1]))
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        cursor = self.encode_cursor("p", self._values(self.page[0]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        body = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            body = {"count": self.count, **body}
+        return Response(body)
+
+
+# ---------------------------------------------------------------------
+# PAGE NUMBERS BY DEFAULT, KEYSET ON REQUEST
+# ---------------------------------------------------------------------
+class OptInCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination (the API default) unless the client opts in:
+    - ?pagination=cursor, or any ?cursor=..., switches to keyset pages
+    - ?count=approx replaces COUNT(*) with the planner's estimate
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        approx = request.query_params.get("count") == "approx"
+        self.keyset = None
+
+        if request.query_params.get("pagination") == "cursor" or "cursor" in request.query_params:
+            self.keyset = KeysetPagination(page_size=self.get_page_size(request), with_count=approx)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if approx:
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
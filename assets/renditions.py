@@ -0,0 +1,124 @@
+import io
+import logging
+import os
+import shutil
+import subprocess
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import AssetVersion, Rendition
+from .taskqueue import enqueue_many
+
+logger = logging.getLogger(__name__)
+
+# kind -> longest edge in pixels
+RENDITION_SIZES = {
+    "thumbnail": 320,
+    "preview": 1280,
+}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+VIDEO_EXTENSIONS = {".mp4", ".webm", ".mov", ".m4v"}
+
+
+# ---------------------------------------------------------------------
+# SOURCE IMAGES
+# ---------------------------------------------------------------------
+def _open_image(fieldfile, max_edge):
+    with fieldfile.storage.open(fieldfile.name, "rb") as fh:
+        image = Image.open(fh)
+        # Let the JPEG decoder downscale while decoding instead of
+        # materialising the full-resolution bitmap first.
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    return image
+
+
+def _video_poster(fieldfile):
+    """Grab one frame with ffmpeg when it is installed; None otherwise."""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-v", "error", "-ss", "1", "-i", fieldfile.path,
+             "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-"],
+            capture_output=True,
+            timeout=60,
+            check=True,
+        )
+    except (subprocess.SubprocessError, OSError, NotImplementedError):
+        return None
+    if not result.stdout:
+        return None
+    return Image.open(io.BytesIO(result.stdout))
+
+
+def _encode(image, max_edge):
+    image = image.copy()
+    image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    if image.mode not in ("RGB", "L"):
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+        image = background
+    buf = io.BytesIO()
+    image.convert("RGB").save(buf, "JPEG", quality=82, optimize=True, progressive=True)
+    return image.size, buf.getvalue()
+
+
+# ---------------------------------------------------------------------
+# GENERATION
+# ---------------------------------------------------------------------
+def generate_renditions(version_id, force=False):
+    """
+    Create the missing renditions for one AssetVersion: thumbnail and web
+    preview for images, a poster frame for video when ffmpeg is available.
+    Other file types are skipped. Returns the kinds that were created.
+    """
+    version = AssetVersion.objects.filter(pk=version_id).first()
+    if version is None or not version.file:
+        return []
+
+    existing = set() if force else set(version.renditions.values_list("kind", flat=True))
+    ext = os.path.splitext(version.file.name)[1].lower()
+    largest = max(RENDITION_SIZES.values())
+
+    if ext in IMAGE_EXTENSIONS:
+        wanted = [k for k in RENDITION_SIZES if k not in existing]
+        if not wanted:
+            return []
+        try:
+            source = _open_image(version.file, largest)
+        except (UnidentifiedImageError, OSError):
+            logger.warning("Could not decode image for version %s", version_id)
+            return []
+        targets = [(kind, RENDITION_SIZES[kind]) for kind in wanted]
+    elif ext in VIDEO_EXTENSIONS and "poster" not in existing:
+        source = _video_poster(version.file)
+        if source is None:
+            return []
+        targets = [("poster", largest)]
+    else:
+        return []
+
+    created = []
+    for kind, max_edge in targets:
+        (width, height), data = _encode(source, max_edge)
+        rendition = (
+            Rendition.objects.filter(version=version, kind=kind).first()
+            or Rendition(version=version, kind=kind)
+        )
+        rendition.width, rendition.height = width, height
+        rendition.file.save(f"{kind}.jpg", ContentFile(data), save=False)
+        rendition.save()
+        created.append(kind)
+    return created
+
+
+# ---------------------------------------------------------------------
+# SCHEDULING
+# ---------------------------------------------------------------------
+def schedule_renditions(*versions):
+    """Queue rendition generation; runs on the task worker after commit."""
+    enqueue_many("renditions.generate", [((version.pk,), f"renditions:{version.pk}") for version in versions])
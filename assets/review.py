@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .metadata import schedule_metadata_extraction
+from .models import Asset, AssetVersion
+from .renditions import schedule_renditions
+from .search import update_search_index
+from .stats import invalidate_stats
+
+DECISIONS = ("approved", "rejected")
+
+
+# ---------------------------------------------------------------------
+# APPROVAL
+# ---------------------------------------------------------------------
+def promote_version(asset, version):
+    """
+    Copy an approved version onto its asset (in memory; the caller saves).
+    Returns the version's tag names when they replace the asset's tags,
+    otherwise None.
+    """
+    asset.title = version.title or asset.title
+    asset.description = version.description or asset.description
+    asset.category = version.category or asset.category
+    # Point the asset at the version's stored blob; nothing is read or
+    # copied, so approval cost does not depend on file size.
+    if version.file:
+        asset.file.name = version.file.name
+    asset.version = version.version
+    tags = list(version.tags.all())
+    return [tag.name for tag in tags] if tags else None
+
+
+def review_versions(version_ids, decision):
+    """
+    Approve or reject many versions in one transaction and return one
+    result per requested id, in request order.
+
+    Statuses change with a single UPDATE; each affected asset is locked
+    once. When several versions of the same asset are approved together,
+    the highest version number is promoted and the others are reported as
+    superseded by it. Every affected asset then points at its latest
+    approved version (rejecting the live version falls back to the
+    previous one).
+    """
+    if decision not in DECISIONS:
+        raise ValueError(f"Invalid decision: {decision}")
+    ids = list(dict.fromkeys(version_ids))
+
+    with transaction.atomic():
+        asset_ids = set(AssetVersion.objects.filter(pk__in=ids).values_list("asset_id", flat=True))
+        # Lock in primary key order so concurrent batches cannot deadlock
+        assets = {
+            asset.pk: asset
+            for asset in Asset.objects.select_for_update(of=("self",))
+            .filter(pk__in=asset_ids)
+            .select_related("category")
+            .prefetch_related("tags")
+            .order_by("pk")
+        }
+        versions = AssetVersion.objects.filter(pk__in=ids).select_related("category")
+        if decision == "approved":
+            versions = versions.prefetch_related("tags")
+        versions = {version.pk: version for version in versions}
+
+        AssetVersion.objects.filter(pk__in=versions).update(status=decision)
+
+        winners = {}
+        if decision == "approved":
+            for version in versions.values():
+                best = winners.get(version.asset_id)
+                if best is None or version.version > best.version:
+                    winners[version.asset_id] = version
+
+        # Latest approved version per affected asset, in one query
+        latest = {}
+        approved = AssetVersion.objects.filter(asset_id__in=assets, status="approved").order_by("asset_id", "-version")
+        for version in approved.only("pk", "asset_id", "version"):
+            latest.setdefault(version.asset_id, version)
+
+        tag_names = {}
+        Through = Asset.tags.through
+        now = timezone.now()
+        for asset in assets.values():
+            if asset.pk in winners:
+                names = promote_version(asset, winners[asset.pk])
+                if names is not None:
+                    tag_names[asset.pk] = names
+            asset.current_version = latest.get(asset.pk)
+            asset.updated_at = now
+
+        Asset.objects.bulk_update(
+            assets.values(), ["title", "description", "category", "file", "version", "current_version", "updated_at"]
+        )
+        if tag_names:
+            Through.objects.filter(asset_id__in=tag_names).delete()
+            Through.objects.bulk_create([
+                Through(asset_id=asset_id, tag_id=tag.pk)
+                for asset_id in tag_names
+                for tag in winners[asset_id].tags.all()
+            ])
+
+        for asset_id in winners:
+            asset = assets[asset_id]
+            names = tag_names.get(asset_id) or [tag.name for tag in asset.tags.all()]
+            update_search_index(asset, tag_names=names)
+        # No-ops when the upload already produced them
+        schedule_renditions(*winners.values())
+        schedule_metadata_extraction(*(assets[asset_id] for asset_id in winners))
+        invalidate_stats()
+
+    results = []
+    for pk in ids:
+        version = versions.get(pk)
+        if version is None:
+            results.append({"id": pk, "status": None, "detail": "Not found"})
+            continue
+        result = {"id": pk, "status": decision}
+        winner = winners.get(version.asset_id)
+        if winner is not None and winner.pk != pk:
+            result["superseded_by"] = winner.pk
+        results.append(result)
+    return results
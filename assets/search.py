@@ -0,0 +1,126 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, Value
+from django.utils import timezone
+from rest_framework import filters
+
+from .models import Asset
+
+SEARCH_CONFIG = "english"
+
+
+# ---------------------------------------------------------------------
+# SEARCH DOCUMENT
+# ---------------------------------------------------------------------
+def flatten_metadata(value):
+    """Return every scalar value inside a metadata JSON blob as a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in flatten_metadata(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in flatten_metadata(v)]
+    return [str(value)]
+
+
+def _search_parts(asset, tag_names=None):
+    if tag_names is None:
+        tag_names = [t.name for t in asset.tags.all()]
+    tags = " ".join(tag_names)
+    category = asset.category.name if asset.category else ""
+    return {
+        "title": asset.title or "",
+        "description": asset.description or "",
+        "taxonomy": f"{tags} {category}".strip(),
+        "metadata": " ".join(flatten_metadata(asset.metadata)),
+    }
+
+
+def search_values(asset, tag_names=None):
+    """
+    Field values for the stored search text of an asset: search_document,
+    plus the weighted search_vector expression on PostgreSQL.
+    """
+    parts = _search_parts(asset, tag_names)
+    values = {"search_document": " ".join(p for p in parts.values() if p)}
+
+    if connections[Asset.objects.db].vendor == "postgresql":
+        values["search_vector"] = (
+            SearchVector(Value(parts["title"]), weight="A", config=SEARCH_CONFIG)
+            + SearchVector(Value(parts["description"]), weight="B", config=SEARCH_CONFIG)
+            + SearchVector(Value(parts["taxonomy"]), weight="C", config=SEARCH_CONFIG)
+            + SearchVector(Value(parts["metadata"]), weight="D", config=SEARCH_CONFIG)
+        )
+    return values
+
+
+def update_search_index(asset, tag_names=None):
+    """
+    Recompute the stored search text for an asset.
+    On PostgreSQL the weighted tsvector is refreshed in the same UPDATE.
+    Pass tag_names when the caller already has them to skip the tag query.
+    """
+    Asset.objects.filter(pk=asset.pk).update(**search_values(asset, tag_names))
+
+
+def reindex_assets(asset_ids, batch_size=500, touch=True):
+    """
+    Recompute the stored search text of many assets, e.g. every asset of a
+    renamed tag or category: a fixed number of queries per batch (assets
+    with their tags and category, then one bulk UPDATE). With `touch`,
+    updated_at moves in the same UPDATE, so cached bodies and ETags of
+    those assets change in every process.
+    """
+    asset_ids = sorted(set(asset_ids))
+    for start in range(0, len(asset_ids), batch_size):
+        assets = list(
+            Asset.objects.filter(pk__in=asset_ids[start:start + batch_size])
+            .select_related("category")
+            .prefetch_related("tags")
+            .only("pk", "title", "description", "metadata", "category__name")
+        )
+        now = timezone.now()
+        fields = []
+        for asset in assets:
+            values = search_values(asset)
+            for field, value in values.items():
+                setattr(asset, field, value)
+            asset.updated_at = now
+            fields = [*values, "updated_at"] if touch else list(values)
+        if assets:
+            Asset.objects.bulk_update(assets, fields)
+    return len(asset_ids)
+
+
+# ---------------------------------------------------------------------
+# SEARCH FILTER (?search=)
+# ---------------------------------------------------------------------
+class AssetSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over the maintained search index.
+    PostgreSQL uses the GIN-indexed tsvector ranked by relevance; other
+    databases (SQLite in development) fall back to substring matching on
+    the flattened search_document.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        if connections[queryset.db].vendor == "postgresql":
+            return self.postgres_search(queryset, terms)
+        return self.fallback_search(queryset, terms)
+
+    def postgres_search(self, queryset, terms):
+        query = SearchQuery(" ".join(terms), config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F("search_vector"), query))
+            .order_by("-search_rank", "-uploaded_at")
+        )
+
+    def fallback_search(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(search_document__icontains=term)
+        return queryset
@@ -1,5 +1,12 @@
 from rest_framework import serializers
-from .models import User, Asset, Category, Tag, AssetVersion
+from django.conf import settings
+from django.db import transaction
+from .models import User, Asset, Category, Tag, AssetVersion, UploadSession
+from .caching import reindex_on_commit
+from .renditions import schedule_renditions
+from .ingest import set_tags
+from .metadata import client_metadata, merge_metadata
+from .metrics import TimedSerializerMixin
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.hashers import make_password
 
@@ -25,7 +32,7 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
 # --------------------------
 # User Serializer
 # --------------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
 
     class Meta:
@@ -61,27 +68,35 @@ class UserSerializer(serializers.ModelSerializer):
 # --------------------------
 # Tag & Category Serializers
 # --------------------------
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "name"]
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name"]
 
 
+def rendition_urls(version):
+    """{kind: url} for a version's renditions (uses the prefetch cache)."""
+    if version is None:
+        return {}
+    return {r.kind: r.file.url for r in version.renditions.all()}
+
+
 # --------------------------
 # AssetVersion Serializer
 # --------------------------
-class AssetVersionSerializer(serializers.ModelSerializer):
+class AssetVersionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False)
     tag_names = serializers.CharField(write_only=True, required=False)
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = AssetVersion
@@ -99,18 +114,59 @@ class AssetVersionSerializer(serializers.ModelSerializer):
             "category_id",
             "tags",
             "tag_names",
+            "renditions",
         ]
         read_only_fields = ["uploaded_at", "uploaded_by", "version", "status"]
 
+    def get_renditions(self, obj):
+        return rendition_urls(obj)
+
+
+# --------------------------
+# Review queue (versions with their asset inlined)
+# --------------------------
+class AssetSummarySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Asset
+        fields = ["id", "title", "version"]
+
+
+class ReviewQueueSerializer(AssetVersionSerializer):
+    asset = AssetSummarySerializer(read_only=True)
+
+    class Meta(AssetVersionSerializer.Meta):
+        fields = AssetVersionSerializer.Meta.fields + ["asset"]
+
+
+# --------------------------
+# Sparse fieldsets (?fields=id,title,...)
+# --------------------------
+class SparseFieldsMixin:
+    """Drop any field not listed in ?fields= on GET requests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = None
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        fields = request.query_params.get("fields")
+        if fields:
+            self.requested_fields = {f.strip() for f in fields.split(",") if f.strip()}
+            for name in set(self.fields) - self.requested_fields:
+                self.fields.pop(name)
+
 
 # --------------------------
 # Asset Serializer
 # --------------------------
-class AssetSerializer(serializers.ModelSerializer):
+class AssetSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False)
     tags = TagSerializer(many=True, read_only=True)
+    tag_names = serializers.CharField(write_only=True, required=False, allow_blank=True)
     versions = AssetVersionSerializer(many=True, read_only=True)
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Asset
@@ -123,17 +179,30 @@ class AssetSerializer(serializers.ModelSerializer):
             "uploaded_by",
             "category_id",
             "tags",
+            "tag_names",
             "metadata",
             "version",
             "parent",
             "versions",
+            "renditions",
         ]
         read_only_fields = ("uploaded_by", "version", "uploaded_at", "versions")
 
+    def get_renditions(self, obj):
+        return rendition_urls(obj.current_version)
+
+    def validate_metadata(self, value):
+        if value is not None and not isinstance(value, dict):
+            raise serializers.ValidationError("Must be a JSON object.")
+        # metadata["technical"] is written by extraction only
+        return client_metadata(value)
+
     # Always return latest approved version for frontend
     def to_representation(self, instance):
         rep = super().to_representation(instance)
-        latest = instance.latest_version()
+        # current_version is kept in sync on approval, so this reads the
+        # select_related/prefetched row instead of querying per asset.
+        latest = instance.current_version
         if latest:
             rep["title"] = latest.title or instance.title
             rep["description"] = latest.description or instance.description
@@ -150,9 +219,20 @@ class AssetSerializer(serializers.ModelSerializer):
             rep["version"] = instance.version
             rep["category"] = CategorySerializer(instance.category).data if instance.category else None
             rep["tags"] = TagSerializer(instance.tags.all(), many=True).data
+        if self.requested_fields is not None:
+            rep = {k: v for k, v in rep.items() if k in self.requested_fields}
         return rep
 
+    def create(self, validated_data):
+        tag_names = validated_data.pop("tag_names", None)
+        instance = super().create(validated_data)
+        if tag_names is not None:
+            set_tags(instance, tag_names)
+        return instance
+
     # Update Asset → create new version if file or admin edits
+    # (atomic: the touches and reindexing its signals ask for run once, on commit)
+    @transaction.atomic
     def update(self, instance, validated_data):
         request = self.context.get("request")
         user = getattr(request, "user", None)
@@ -160,6 +240,8 @@ class AssetSerializer(serializers.ModelSerializer):
         tag_names = validated_data.pop("tag_names", None)
         tags_data = validated_data.pop("tags", None)
         new_file = validated_data.pop("file", None)
+        if "metadata" in validated_data:
+            validated_data["metadata"] = merge_metadata(instance.metadata, validated_data["metadata"], partial=self.partial)
 
         # Update basic fields
         for attr, value in validated_data.items():
@@ -173,24 +255,16 @@ class AssetSerializer(serializers.ModelSerializer):
             except Category.DoesNotExist:
                 pass
 
-        # Update tags from tag_names
-        if tag_names is not None:
-            instance.tags.clear()
-            for t in [x.strip() for x in tag_names.split(",") if x.strip()]:
-                tag_obj, _ = Tag.objects.get_or_create(name=t)
-                instance.tags.add(tag_obj)
-
-        # Update tags from tags_data
+        # Update tags from tag_names, or from tags_data when both are sent
         if tags_data is not None:
-            instance.tags.clear()
-            for t in tags_data:
-                tag_obj, _ = Tag.objects.get_or_create(name=t.get("name"))
-                instance.tags.add(tag_obj)
+            tag_names = [t.get("name") for t in tags_data]
+        tags = set_tags(instance, tag_names) if tag_names is not None else None
 
         # Create new version if file changed or admin edits
         if new_file or (user and user.role == "admin"):
-            latest_version = instance.latest_version()
-            version_number = (latest_version.version + 1) if latest_version else 1
+            # From the versions the viewset prefetched, not another query
+            approved = [v.version for v in instance.versions.all() if v.status == "approved"]
+            version_number = max(approved) + 1 if approved else 1
 
             asset_version = AssetVersion.objects.create(
                 asset=instance,
@@ -203,9 +277,87 @@ class AssetSerializer(serializers.ModelSerializer):
                 category=instance.category,
             )
 
-            # Copy tags
-            for tag in instance.tags.all():
-                asset_version.tags.add(tag)
+            # Copy tags (one INSERT for all of them)
+            asset_version.tags.add(*(instance.tags.all() if tags is None else tags))
+            schedule_renditions(asset_version)
+
+            if asset_version.status == "approved":
+                instance.current_version = asset_version
 
         instance.save()
+        reindex_on_commit(instance.pk)
         return instance
+
+
+# --------------------------
+# Asset List Serializer (gallery cards, no version history)
+# --------------------------
+class AssetListSerializer(AssetSerializer):
+    class Meta(AssetSerializer.Meta):
+        fields = [
+            "id",
+            "title",
+            "description",
+            "file",
+            "uploaded_at",
+            "uploaded_by",
+            "tags",
+            "metadata",
+            "version",
+            "renditions",
+        ]
+
+
+# --------------------------
+# Chunked Upload Session Serializer
+# --------------------------
+class UploadSessionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    part_size = serializers.IntegerField(required=False)
+    part_count = serializers.IntegerField(read_only=True)
+    uploaded_parts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "filename",
+            "size",
+            "part_size",
+            "part_count",
+            "sha256",
+            "asset",
+            "fields",
+            "status",
+            "uploaded_parts",
+            "created_at",
+            "completed_at",
+        ]
+        read_only_fields = ["status", "created_at", "completed_at"]
+
+    def get_uploaded_parts(self, obj):
+        return [p.number for p in obj.parts.all()]
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be positive.")
+        return value
+
+    def validate_part_size(self, value):
+        minimum = getattr(settings, "CHUNKED_UPLOAD_MIN_PART_SIZE", 256 * 1024)
+        maximum = getattr(settings, "CHUNKED_UPLOAD_MAX_PART_SIZE", 64 * 1024 * 1024)
+        if not minimum <= value <= maximum:
+            raise serializers.ValidationError(f"Part size must be between {minimum} and {maximum} bytes.")
+        return value
+
+    def validate_fields(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Expected an object.")
+        if "metadata" in value:
+            if value["metadata"] is not None and not isinstance(value["metadata"], dict):
+                raise serializers.ValidationError("metadata must be an object.")
+            value = {**value, "metadata": client_metadata(value["metadata"])}
+        return value
+
+    def create(self, validated_data):
+        validated_data.setdefault("part_size", getattr(settings, "CHUNKED_UPLOAD_PART_SIZE", 8 * 1024 * 1024))
+        return super().create(validated_data)
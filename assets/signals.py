@@ -0,0 +1,154 @@
+"""Cache invalidation and search reindexing for ORM writes (save/delete/m2m).
+
+Bulk paths (bulk_create, bulk_update, QuerySet.update) send no signals and
+invalidate explicitly; see assets.ingest and assets.review.
+"""
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .authentication import forget_user_state
+from .caching import invalidate_all_assets, reindex_on_commit, touch_assets
+from .models import Asset, AssetVersion, Category, Rendition, Tag, User
+from .search import reindex_assets
+from .stats import invalidate_stats
+
+
+@receiver(post_save, sender=Asset)
+@receiver(post_delete, sender=Asset)
+@receiver(post_save, sender=AssetVersion)
+@receiver(post_delete, sender=AssetVersion)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Asset.tags.through)
+def asset_data_changed(sender, **kwargs):
+    invalidate_stats()
+
+
+# ---------------------------------------------------------------------
+# SERIALIZED ASSET CACHE (assets.caching)
+# ---------------------------------------------------------------------
+# User fields embedded in asset representations (UserSerializer)
+USER_SHOWN_FIELDS = {"username", "first_name", "last_name", "email", "role"}
+
+
+def _related_assets(instance):
+    """Assets that show a tag, category or user, directly or through a version."""
+    if isinstance(instance, Tag):
+        match = Q(tags=instance) | Q(versions__tags=instance)
+    elif isinstance(instance, Category):
+        match = Q(category=instance) | Q(versions__category=instance)
+    else:
+        match = Q(uploaded_by=instance) | Q(versions__uploaded_by=instance)
+    return Asset.objects.filter(match)
+
+
+def _related_asset_ids(instance):
+    return list(_related_assets(instance).values_list("pk", flat=True).distinct())
+
+
+# Asset saves move updated_at themselves; changes to related rows touch it.
+@receiver(post_save, sender=AssetVersion)
+@receiver(post_delete, sender=AssetVersion)
+def version_changed(sender, instance, **kwargs):
+    touch_assets(instance.asset_id)
+
+
+@receiver(post_save, sender=Rendition)
+@receiver(post_delete, sender=Rendition)
+def rendition_changed(sender, instance, **kwargs):
+    touch_assets(*AssetVersion.objects.filter(pk=instance.version_id).values_list("asset_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Asset.tags.through)
+@receiver(m2m_changed, sender=AssetVersion.tags.through)
+def tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            touch_assets(instance.pk if isinstance(instance, Asset) else instance.asset_id)
+    elif sender is AssetVersion.tags.through:
+        # tag.versioned_assets.add(...) etc.; clear() does not say which rows changed
+        if action == "pre_clear":
+            instance._touched_asset_ids = _related_asset_ids(instance)
+        elif action == "post_clear":
+            touch_assets(*getattr(instance, "_touched_asset_ids", []))
+        elif action in ("post_add", "post_remove"):
+            touch_assets(*AssetVersion.objects.filter(pk__in=pk_set or []).values_list("asset_id", flat=True))
+    # Reverse Asset.tags changes reindex the assets (asset_tags_changed),
+    # which moves their updated_at
+
+
+# Tags, categories and users are embedded in many assets. Tag and category
+# changes reindex the assets that show them (below), which moves their
+# updated_at; user changes touch the assets they uploaded or versioned.
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def shared_object_changed(sender, created=False, **kwargs):
+    # A new tag/category/user is not part of any cached asset yet
+    if not created:
+        invalidate_all_assets()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    # Logins save last_login only, which no asset shows
+    if created or (update_fields is not None and not set(update_fields) & USER_SHOWN_FIELDS):
+        return
+    _related_assets(instance).update(updated_at=timezone.now())
+
+
+# ---------------------------------------------------------------------
+# SEARCH INDEX (assets.search)
+# ---------------------------------------------------------------------
+# Tag and category names are part of each asset's stored search text.
+# Deletes cascade (tags) or SET_NULL (categories) without per-asset
+# signals, so the affected ids are collected before the delete.
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Category)
+def taxonomy_saved(sender, instance, created=False, **kwargs):
+    if not created:
+        reindex_assets(_related_asset_ids(instance))
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Category)
+def taxonomy_deleting(sender, instance, **kwargs):
+    instance._search_asset_ids = _related_asset_ids(instance)
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Category)
+def taxonomy_deleted(sender, instance, **kwargs):
+    reindex_assets(getattr(instance, "_search_asset_ids", []))
+
+
+@receiver(m2m_changed, sender=Asset.tags.through)
+def asset_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            reindex_on_commit(instance.pk)
+    elif action == "pre_clear":
+        # tag.assets.clear(): pk_set is not given
+        instance._search_asset_ids = _related_asset_ids(instance)
+    elif action == "post_clear":
+        reindex_assets(getattr(instance, "_search_asset_ids", []))
+    elif action in ("post_add", "post_remove"):
+        reindex_assets(pk_set or [])
+
+
+# ---------------------------------------------------------------------
+# AUTHENTICATION STATE (assets.authentication)
+# ---------------------------------------------------------------------
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_user_state(instance.pk)
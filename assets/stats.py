@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Asset, AssetVersion, Category, Tag, metadata_key
+
+STATS_CACHE_KEY = "assets:stats"
+
+
+def _bytes():
+    # Stored size from the extracted technical metadata (see assets.metadata)
+    return Coalesce(Sum(metadata_key("technical.size_bytes", BigIntegerField())), 0)
+
+
+# ---------------------------------------------------------------------
+# AGGREGATES
+# ---------------------------------------------------------------------
+def compute_stats():
+    """Dashboard counts; every breakdown is a single GROUP BY query."""
+    top_tags = getattr(settings, "STATS_TOP_TAGS", 50)
+    totals = Asset.objects.aggregate(assets=Count("pk"), storage_bytes=_bytes())
+    totals["categories"] = Category.objects.count()
+    totals["tags"] = Tag.objects.count()
+
+    by_category = [
+        {"id": row["category_id"], "name": row["category__name"], "assets": row["assets"], "storage_bytes": row["storage_bytes"]}
+        for row in Asset.objects.order_by()
+        .values("category_id", "category__name")
+        .annotate(assets=Count("pk"), storage_bytes=_bytes())
+        .order_by("-assets", "category__name")
+    ]
+    by_tag = [
+        {"id": row["id"], "name": row["name"], "assets": row["asset_count"]}
+        for row in Tag.objects.annotate(asset_count=Count("assets"))
+        .filter(asset_count__gt=0)
+        .values("id", "name", "asset_count")
+        .order_by("-asset_count", "name")[:top_tags]
+    ]
+    by_status = {choice: 0 for choice, _ in AssetVersion.STATUS_CHOICES}
+    for row in AssetVersion.objects.order_by().values("status").annotate(versions=Count("pk")):
+        by_status[row["status"]] = row["versions"]
+    by_uploader = [
+        {"id": row["uploaded_by_id"], "username": row["uploaded_by__username"], "assets": row["assets"]}
+        for row in Asset.objects.order_by()
+        .values("uploaded_by_id", "uploaded_by__username")
+        .annotate(assets=Count("pk"))
+        .order_by("-assets", "uploaded_by__username")
+    ]
+
+    return {
+        "totals": totals,
+        "by_category": by_category,
+        "by_tag": by_tag,
+        "versions_by_status": by_status,
+        "by_uploader": by_uploader,
+        "generated_at": timezone.now().isoformat(),
+    }
+
+
+# ---------------------------------------------------------------------
+# CACHE
+# ---------------------------------------------------------------------
+def get_stats():
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(STATS_CACHE_KEY, stats, getattr(settings, "STATS_CACHE_TIMEOUT", 300))
+    return stats
+
+
+def invalidate_stats():
+    """
+    Drop the cached stats once the current transaction commits, so a
+    concurrent request cannot re-cache numbers from before the write.
+    """
+    transaction.on_commit(lambda: cache.delete(STATS_CACHE_KEY))
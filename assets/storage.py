@@ -0,0 +1,134 @@
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+
+BLOB_PREFIX = "blobs"
+BLOB_NAME = re.compile(rf"^{BLOB_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/(?P<hash>[0-9a-f]{{64}})(\.\w+)?$")
+BLOB_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+# (model label, field name) of every FileField stored in blob storage.
+# The garbage collector only keeps blobs referenced from one of these.
+BLOB_REFERENCES = [
+    ("assets.Asset", "file"),
+    ("assets.AssetVersion", "file"),
+    ("assets.Rendition", "file"),
+]
+
+
+# ---------------------------------------------------------------------
+# CONTENT-ADDRESSED STORAGE
+# ---------------------------------------------------------------------
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store every file once under blobs/<aa>/<bb>/<sha256><ext>.
+    The hash is computed while streaming the upload to a temp file, so
+    identical uploads (and asset/version pairs sharing a file) resolve to
+    the same blob instead of new copies with random suffixes.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content hash in _save().
+        return name
+
+    def _save(self, name, content):
+        ext = blob_extension(name)
+        tmp_dir = self.path(os.path.join(BLOB_PREFIX, "tmp"))
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            sha = digest.hexdigest()
+            blob_name = f"{BLOB_PREFIX}/{sha[:2]}/{sha[2:4]}/{sha}{ext}"
+            self.adopt(tmp_path, blob_name)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return blob_name
+
+    def adoption_name(self, path, name, expected_sha256=None):
+        """
+        Hash a finished local file and return the blob name adopt() would
+        move it to. Raises ValueError if the hash does not match.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        sha = digest.hexdigest()
+        if expected_sha256 and sha != expected_sha256.lower():
+            raise ValueError(f"SHA-256 mismatch: expected {expected_sha256}, got {sha}")
+        return f"{BLOB_PREFIX}/{sha[:2]}/{sha[2:4]}/{sha}{blob_extension(name)}"
+
+    def adopt(self, path, blob_name):
+        """
+        Move a local file (same filesystem) to `blob_name` by rename instead
+        of copying it. If the blob already exists the file is removed.
+        """
+        blob_path = self.path(blob_name)
+        if os.path.exists(blob_path):
+            os.remove(path)
+            touch_blob(blob_path)
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(path, blob_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(blob_path, self.file_permissions_mode)
+
+
+def blob_extension(name):
+    """
+    The lower-cased extension of `name` if BLOB_NAME accepts it, else "".
+    Anything else ("notes.my-ext", "main.c++") would make gc_blobs treat
+    the stored blob as a stray file.
+    """
+    ext = os.path.splitext(name)[1].lower()
+    return ext if BLOB_EXTENSION.match(ext) else ""
+
+
+def touch_blob(path):
+    # A deduplicated upload is about to reference this blob: restart the
+    # gc_blobs grace period so an old unreferenced copy is not deleted now.
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def asset_storage():
+    return content_addressed_storage
+
+
+def blob_hash(name):
+    """Return the SHA-256 encoded in a blob name, or None for legacy paths."""
+    match = BLOB_NAME.match(name or "")
+    return match.group("hash") if match else None
+
+
+# ---------------------------------------------------------------------
+# REFERENCE COUNTS
+# ---------------------------------------------------------------------
+def blob_reference_counts():
+    """Return Counter({blob name: number of rows pointing at it})."""
+    counts = Counter()
+    for label, field in BLOB_REFERENCES:
+        model = apps.get_model(label)
+        names = model.objects.filter(**{f"{field}__startswith": f"{BLOB_PREFIX}/"}).values_list(field, flat=True)
+        counts.update(names.iterator())
+    return counts
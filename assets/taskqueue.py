@@ -0,0 +1,265 @@
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# name -> callable, filled by @task in each app's tasks.py
+REGISTRY = {}
+# name -> seconds, for tasks declared with their own timeout
+TIMEOUTS = {}
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+# Error recorded for tasks lost when a pool process dies
+POOL_BROKEN = "Worker process died while running the task (BrokenProcessPool)"
+
+
+# ---------------------------------------------------------------------
+# DECLARING AND ENQUEUING TASKS
+# ---------------------------------------------------------------------
+def task(name, timeout=None):
+    """
+    Register a function as a queue task under `name`. A worker stops it
+    after `timeout` seconds (default TASK_TIMEOUT) and counts a failed
+    attempt.
+    """
+    def decorator(func):
+        REGISTRY[name] = func
+        if timeout is not None:
+            TIMEOUTS[name] = timeout
+        return func
+    return decorator
+
+
+def task_timeout(name):
+    return TIMEOUTS.get(name, getattr(settings, "TASK_TIMEOUT", 300))
+
+
+def discover_tasks():
+    autodiscover_modules("tasks")
+
+
+def enqueue(name, *args, key=None, max_attempts=3, delay=0):
+    """
+    Queue `name(*args)` for a worker. The row is written in the caller's
+    transaction, so a rolled back request never leaves a task behind.
+    With `key`, a second enqueue of the same work returns the existing
+    task instead of queuing a duplicate.
+
+    TASK_ALWAYS_EAGER runs the task in-process after commit instead
+    (development and tests without a worker).
+    """
+    if getattr(settings, "TASK_ALWAYS_EAGER", False):
+        transaction.on_commit(lambda: run_task_now(name, list(args)))
+        return None
+
+    defaults = {
+        "name": name,
+        "args": list(args),
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + timedelta(seconds=delay),
+    }
+    if key is None:
+        return Task.objects.create(**defaults)
+    queued, _ = Task.objects.get_or_create(idempotency_key=key, defaults=defaults)
+    return queued
+
+
+def enqueue_many(name, jobs, max_attempts=3):
+    """
+    Queue `name(*args)` for every (args, key) pair in `jobs` with a single
+    INSERT; keys that are already queued are skipped, as with enqueue().
+    """
+    jobs = list(jobs)
+    if getattr(settings, "TASK_ALWAYS_EAGER", False):
+        for args, _ in jobs:
+            transaction.on_commit(lambda args=args: run_task_now(name, list(args)))
+        return
+    now = timezone.now()
+    Task.objects.bulk_create(
+        [
+            Task(name=name, args=list(args), idempotency_key=key, max_attempts=max_attempts, run_after=now)
+            for args, key in jobs
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def run_task_now(name, args):
+    if name not in REGISTRY:
+        discover_tasks()
+    return REGISTRY[name](*args)
+
+
+# ---------------------------------------------------------------------
+# WORKER SIDE
+# ---------------------------------------------------------------------
+def _init_process():
+    import django
+    django.setup()
+    discover_tasks()
+
+
+def _timed_out(signum, frame):
+    raise TaskTimeout("Task exceeded its timeout")
+
+
+def _execute(name, args):
+    """Runs inside a pool process; returns (error or None, duration_ms)."""
+    close_old_connections()
+    # Tasks run on the pool process's main thread, so SIGALRM reaches them
+    timeout = task_timeout(name)
+    signal.signal(signal.SIGALRM, _timed_out)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        run_task_now(name, args)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        close_old_connections()
+    return error, (time.perf_counter() - start) * 1000
+
+
+def claim(worker_id, limit):
+    """Atomically mark up to `limit` due tasks as running for this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        due = Task.objects.filter(status="queued", run_after__lte=now).order_by("run_after", "pk")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("pk", flat=True)[:limit])
+        Task.objects.filter(pk__in=ids, status="queued").update(
+            status="running", locked_by=worker_id, locked_at=now, attempts=F("attempts") + 1
+        )
+    return list(Task.objects.filter(pk__in=ids, status="running", locked_by=worker_id))
+
+
+def requeue_stale(lock_timeout, worker_id=None, inflight=()):
+    """
+    Give tasks held by a crashed worker back to the queue, or fail them
+    once they have used up max_attempts (a task that keeps killing its
+    worker would otherwise loop forever). Tasks this worker still runs
+    (`inflight` ids) are left alone; workers stop tasks at their timeout,
+    which is below lock_timeout, so anything older was abandoned.
+    """
+    now = timezone.now()
+    stale = Task.objects.filter(status="running", locked_at__lt=now - timedelta(seconds=lock_timeout))
+    if worker_id and inflight:
+        stale = stale.exclude(locked_by=worker_id, pk__in=list(inflight))
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", locked_by="", locked_at=None, finished_at=now,
+        last_error=f"Worker lost the task for more than {lock_timeout} s on its last attempt",
+    )
+    if failed:
+        logger.error("Failed %s abandoned task(s) that had no attempts left", failed)
+    return stale.filter(attempts__lt=F("max_attempts")).update(status="queued", locked_by="", locked_at=None)
+
+
+def record_result(queued, error, duration_ms):
+    now = timezone.now()
+    queued.duration_ms = duration_ms
+    queued.locked_by, queued.locked_at = "", None
+    if error is None:
+        queued.status, queued.last_error, queued.finished_at = "done", "", now
+    elif queued.attempts < queued.max_attempts:
+        # exponential backoff: 2, 4, 8... seconds
+        queued.status, queued.last_error = "queued", error
+        queued.run_after = now + timedelta(seconds=2 ** queued.attempts)
+    else:
+        queued.status, queued.last_error, queued.finished_at = "failed", error, now
+        logger.error("Task %s failed after %s attempts:\n%s", queued, queued.attempts, error)
+    queued.save(update_fields=[
+        "status", "last_error", "duration_ms", "run_after", "locked_by", "locked_at", "finished_at",
+    ])
+
+
+def run_worker(processes=2, poll_interval=1.0, lock_timeout=600, once=False, stdout=None):
+    """
+    Claim due tasks and run them on a process pool until interrupted.
+    With once=True, return as soon as the queue is drained.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    discover_tasks()
+    longest = max([task_timeout(name) for name in REGISTRY] or [0])
+    if longest >= lock_timeout:
+        raise ImproperlyConfigured(
+            f"TASK_LOCK_TIMEOUT ({lock_timeout} s) must exceed the longest task timeout ({longest} s)."
+        )
+    inflight = {}
+    pool = _start_pool(processes)
+    try:
+        while True:
+            requeue_stale(lock_timeout, worker_id, [queued.pk for queued in inflight.values()])
+            free = processes - len(inflight)
+            broken = False
+            if free > 0:
+                for queued in claim(worker_id, free):
+                    try:
+                        inflight[pool.submit(_execute, queued.name, queued.args)] = queued
+                    except BrokenProcessPool:
+                        _finish(queued, POOL_BROKEN, None, stdout)
+                        broken = True
+
+            if not inflight and not broken:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(inflight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                queued = inflight.pop(future)
+                try:
+                    error, duration_ms = future.result()
+                except BrokenProcessPool:
+                    error, duration_ms, broken = POOL_BROKEN, None, True
+                except Exception:
+                    error, duration_ms = traceback.format_exc(), None
+                _finish(queued, error, duration_ms, stdout)
+
+            if broken:
+                # A pool process died (segfault, OOM kill): the pool refuses
+                # new work and every task still on it is lost with it
+                logger.error("Task pool broke; restarting it")
+                for queued in inflight.values():
+                    _finish(queued, POOL_BROKEN, None, stdout)
+                inflight.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _start_pool(processes)
+    finally:
+        pool.shutdown()
+
+
+def _start_pool(processes):
+    # Forked pool processes must not share the parent's DB sockets
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_process)
+
+
+def _finish(queued, error, duration_ms, stdout):
+    record_result(queued, error, duration_ms)
+    if stdout is not None:
+        state = "ok" if error is None else "error"
+        stdout.write(f"{queued.name}{tuple(queued.args)} {state} in {duration_ms or 0:.0f} ms")
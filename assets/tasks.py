@@ -0,0 +1,14 @@
+"""Background tasks run by `manage.py run_task_worker` (see assets.taskqueue)."""
+from .metadata import apply_technical_metadata
+from .renditions import generate_renditions
+from .taskqueue import task
+
+
+@task("renditions.generate")
+def generate_renditions_task(version_id):
+    generate_renditions(version_id)
+
+
+@task("metadata.extract")
+def extract_metadata_task(asset_id):
+    apply_technical_metadata(asset_id)
@@ -0,0 +1,21 @@
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+
+from assets.management.commands.check_query_budgets import Command
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every API route within its query budget (check_query_budgets), with
+    query counts that do not grow with the rows listed or the tags set.
+    Response times are left to the command: they depend on the machine.
+    """
+
+    def test_routes_within_query_budgets(self):
+        out = StringIO()
+        options = {"repeat": 1, "no_time": True, "time_factor": 1.0, "show_sql": False}
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            failures = Command(stdout=out).check_all(options)
+        self.assertEqual(failures, [], out.getvalue())
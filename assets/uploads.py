@@ -0,0 +1,200 @@
+import glob
+import hashlib
+import os
+import tempfile
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .ingest import ingest_assets, resolve_category, submit_version
+from .models import UploadPart, UploadSession
+from .storage import content_addressed_storage
+
+UPLOAD_DIR = "uploads"
+READ_SIZE = 64 * 1024
+COPY_SIZE = 1024 * 1024
+
+
+# ---------------------------------------------------------------------
+# STAGING FILE
+# ---------------------------------------------------------------------
+def upload_path(session):
+    """
+    Parts are written straight into one preallocated file per session,
+    under MEDIA_ROOT so completion can rename it into blob storage.
+    """
+    return content_addressed_storage.path(f"{UPLOAD_DIR}/{session.pk}.part")
+
+
+def start_upload(session):
+    path = upload_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.truncate(session.size)
+
+
+def discard_upload(session):
+    path = upload_path(session)
+    for name in [path, *glob.glob(part_temp_pattern(session))]:
+        if os.path.exists(name):
+            os.remove(name)
+
+
+def part_temp_pattern(session):
+    # Parts received but not yet copied into the staging file
+    return os.path.join(os.path.dirname(upload_path(session)), f"{session.pk}.*.tmp")
+
+
+# ---------------------------------------------------------------------
+# SESSION LOCK
+# ---------------------------------------------------------------------
+def lock_session(session, shared=False):
+    """
+    Re-read the session under a row lock; call inside transaction.atomic().
+    Part writes take it shared (FOR SHARE on PostgreSQL) while they copy a
+    received part into the staging file, so parts still land in parallel;
+    completion takes it exclusively, so it waits for those copies and later
+    part writes see the session completed.
+    """
+    if shared and connection.vendor == "postgresql":
+        table = connection.ops.quote_name(UploadSession._meta.db_table)
+        locked = list(UploadSession.objects.raw(f"SELECT * FROM {table} WHERE id = %s FOR SHARE", [session.pk]))
+        if not locked:
+            raise UploadSession.DoesNotExist
+        return locked[0]
+    return UploadSession.objects.select_for_update().get(pk=session.pk)
+
+
+# ---------------------------------------------------------------------
+# PARTS
+# ---------------------------------------------------------------------
+def write_part(session, number, stream, expected_sha256=None):
+    """
+    Stream one part from `stream` into its byte range of the staging file.
+    Parts cover disjoint ranges, so they can be uploaded in parallel and
+    re-sent after a dropped connection; the latest successful write wins.
+    The client's upload goes to a temp file first, so the session lock is
+    only held to copy it into place and record the part.
+    """
+    _check_part(session, number)
+    expected = session.part_length(number)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(upload_path(session)), prefix=f"{session.pk}.{number}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            written, sha = _receive_part(stream, tmp, expected)
+        if written != expected:
+            raise ValidationError({"detail": f"Part {number} must be {expected} bytes, got {written}"})
+        if expected_sha256 and sha != expected_sha256.lower():
+            raise ValidationError({"detail": f"Checksum mismatch for part {number}"})
+
+        with transaction.atomic():
+            session = lock_session(session, shared=True)
+            _check_part(session, number)
+            _copy_part(tmp_path, session, number)
+            part, _ = UploadPart.objects.update_or_create(
+                session=session, number=number, defaults={"size": written, "sha256": sha}
+            )
+    finally:
+        os.remove(tmp_path)
+    return part
+
+
+def _check_part(session, number):
+    if session.status != "active":
+        raise ValidationError({"detail": f"Upload is {session.status}"})
+    if not 1 <= number <= session.part_count:
+        raise ValidationError({"detail": f"Part number must be between 1 and {session.part_count}"})
+
+
+def _receive_part(stream, out, expected):
+    """Copy at most expected + 1 bytes (enough to tell it is too long); return (size, sha256)."""
+    digest = hashlib.sha256()
+    written = 0
+    while written <= expected:
+        chunk = stream.read(min(READ_SIZE, expected + 1 - written))
+        if not chunk:
+            break
+        digest.update(chunk)
+        if written + len(chunk) <= expected:
+            out.write(chunk)
+        written += len(chunk)
+    return written, digest.hexdigest()
+
+
+def _copy_part(tmp_path, session, number):
+    offset = (number - 1) * session.part_size
+    fd = os.open(upload_path(session), os.O_WRONLY)
+    try:
+        with open(tmp_path, "rb") as src:
+            while chunk := src.read(COPY_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------
+# COMPLETION
+# ---------------------------------------------------------------------
+def session_category(fields):
+    # "category_id" as documented on UploadSession.fields; "category" (an id
+    # or a name, like request_update's field) is accepted as well
+    return fields.get("category_id") or fields.get("category")
+
+
+def complete_upload(session):
+    """
+    Turn a fully uploaded session into a new Asset (approved, through the
+    bulk ingest path) or, when session.asset is set, a pending AssetVersion.
+    The staging file is renamed into blob storage after commit, never copied.
+    """
+    with transaction.atomic():
+        session = lock_session(session)
+        if session.status != "active":
+            raise ValidationError({"detail": f"Upload is {session.status}"})
+
+        received = set(session.parts.values_list("number", flat=True))
+        missing = [n for n in range(1, session.part_count + 1) if n not in received]
+        if missing:
+            raise ValidationError({"detail": "Missing parts", "missing_parts": missing})
+
+        path = upload_path(session)
+        try:
+            stored = content_addressed_storage.adoption_name(path, session.filename, session.sha256)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+        # Renamed only once the rows exist: a rolled back completion leaves
+        # the staging file in place, so the client can simply retry
+        transaction.on_commit(lambda: content_addressed_storage.adopt(path, stored))
+
+        fields = session.fields or {}
+        if session.asset_id:
+            result = submit_version(
+                session.asset,
+                session.user,
+                file=stored,
+                comment=fields.get("comment", ""),
+                title=fields.get("title", session.asset.title),
+                description=fields.get("description", session.asset.description),
+                category=resolve_category(session_category(fields)),
+                tags=fields.get("tags"),
+            )
+        else:
+            category = resolve_category(session_category(fields))
+            result = ingest_assets([{
+                "stored_name": stored,
+                "filename": session.filename,
+                "title": fields.get("title"),
+                "description": fields.get("description"),
+                "category_id": category.pk if category else None,
+                "tags": fields.get("tags"),
+                "metadata": fields.get("metadata"),
+            }], session.user)[0]
+
+        session.status = "complete"
+        session.completed_at = timezone.now()
+        session.save(update_fields=["status", "completed_at"])
+    return result
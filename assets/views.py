@@ -1,11 +1,35 @@
-from rest_framework import viewsets, permissions, parsers, filters, status
+import hmac
+import json
+
+from rest_framework import viewsets, mixins, permissions, parsers, filters, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters import rest_framework as django_filters
-from .models import User, Asset, Category, Tag, AssetVersion
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from .models import User, Asset, Category, Tag, AssetVersion, UploadSession
+from .search import AssetSearchFilter
+from .pagination import OptInCursorPagination
+from .ingest import ingest_assets, manifest_item, resolve_category, set_tags, submit_version
+from .downloads import download_filename, file_etag, serve_file
+from .exports import export_entries, stream_zip
+from .renditions import schedule_renditions
+from .review import review_versions
+from .stats import get_stats
+from .caching import cache_counters, cached_representation, reindex_on_commit, representation_key
+from .conditional import ConditionalListMixin, make_etag, not_modified, with_etag
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from .metadata import META_PARAM, filter_metadata, filter_metadata_params, schedule_metadata_extraction
+from .uploads import complete_upload, discard_upload, start_upload, write_part
 from .serializers import (
-    UserSerializer, AssetSerializer, CategorySerializer,
-    TagSerializer, AssetVersionSerializer, MyTokenObtainPairSerializer
+    UserSerializer, AssetSerializer, AssetListSerializer, CategorySerializer,
+    TagSerializer, AssetVersionSerializer, MyTokenObtainPairSerializer, ReviewQueueSerializer,
+    UploadSessionSerializer,
 )
 from rest_framework_simplejwt.views import TokenObtainPairView
 
@@ -23,6 +47,33 @@ def me_view(request):
         "role": getattr(user, "role", None),
     })
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def stats_view(request):
+    """Dashboard counts by category, tag, version status and uploader (cached)."""
+    return Response(get_stats())
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def cache_stats_view(request):
+    """Hit/miss counters of the serialized asset cache (admins only)."""
+    if getattr(request.user, "role", "").lower() != "admin":
+        return Response({"detail": "Admins only"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(cache_counters())
+
+def metrics_view(request):
+    """
+    Request metrics in Prometheus text format, for scrapers sending
+    "Authorization: Bearer <METRICS_TOKEN>". The peer address proves
+    nothing behind a reverse proxy, so there is no IP allowlist; without
+    a token configured the endpoint is closed.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if not token or scheme.lower() != "bearer" or not hmac.compare_digest(credentials.encode(), token.encode()):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
 # ---------------------------------------------------------------------
 # AUTH VIEW
 # ---------------------------------------------------------------------
@@ -138,24 +189,115 @@ class AssetFilter(django_filters.FilterSet):
     date_to = django_filters.DateFilter(field_name="uploaded_at", lookup_expr="lte")
     category = django_filters.NumberFilter(field_name="category__id")
 
+    # Technical metadata extracted by assets.metadata (expression indexed)
+    mime_type = django_filters.CharFilter(method="filter_technical")
+    min_width = django_filters.NumberFilter(method="filter_technical")
+    max_width = django_filters.NumberFilter(method="filter_technical")
+    min_height = django_filters.NumberFilter(method="filter_technical")
+    max_height = django_filters.NumberFilter(method="filter_technical")
+    min_size = django_filters.NumberFilter(method="filter_technical")
+    max_size = django_filters.NumberFilter(method="filter_technical")
+
+    # filter name -> (metadata path, lookup)
+    TECHNICAL_FILTERS = {
+        "mime_type": ("technical.mime_type", "exact"),
+        "min_width": ("technical.width", "gte"),
+        "max_width": ("technical.width", "lte"),
+        "min_height": ("technical.height", "gte"),
+        "max_height": ("technical.height", "lte"),
+        "min_size": ("technical.size_bytes", "gte"),
+        "max_size": ("technical.size_bytes", "lte"),
+    }
+
     class Meta:
         model = Asset
         fields = ["uploaded_by", "category", "tags", "date_from", "date_to"]
 
+    def filter_technical(self, queryset, name, value):
+        path, lookup = self.TECHNICAL_FILTERS[name]
+        return filter_metadata(queryset, path, lookup, value)
+
+    def filter_queryset(self, queryset):
+        # Typed key/value filters on Asset.metadata: ?meta.client=acme,
+        # ?meta.technical.width__gte=1920 (see assets.metadata)
+        return filter_metadata_params(super().filter_queryset(queryset), self.data)
+
 
 # ---------------------------------------------------------------------
 # ASSETS
 # ---------------------------------------------------------------------
-class AssetViewSet(viewsets.ModelViewSet):
-    queryset = Asset.objects.prefetch_related("tags", "versions", "category").all()
+class AssetViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Asset.objects.select_related(
+        "uploaded_by", "category", "current_version__category"
+    ).prefetch_related("tags", "current_version__tags", "current_version__renditions").all()
     serializer_class = AssetSerializer
     permission_classes = [IsAdminEditorOrReadOnly]
+    pagination_class = OptInCursorPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
-    filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [django_filters.DjangoFilterBackend, AssetSearchFilter, filters.OrderingFilter]
     filterset_class = AssetFilter
-    search_fields = ["title", "description", "metadata"]
     ordering_fields = ["uploaded_at", "title"]
 
+    def _wants_versions(self):
+        """Version history is only rendered on detail or with ?expand=versions."""
+        params = self.request.query_params
+        fields = params.get("fields")
+        if fields and "versions" not in [f.strip() for f in fields.split(",")]:
+            return False
+        if self.action == "list":
+            return "versions" in [e.strip() for e in params.get("expand", "").split(",")]
+        return True
+
+    def get_serializer_class(self):
+        if self.action == "list" and not self._wants_versions():
+            return AssetListSerializer
+        return AssetSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the representation from the per-asset cache (assets.caching).
+        One cheap lookup of the version markers builds the ETag and the
+        cache key: a matching If-None-Match gets a 304, and the full
+        queryset and serializer only run on a cache miss.
+        """
+        try:
+            marker = (
+                Asset.objects.filter(pk=kwargs["pk"])
+                .values_list("version", "current_version_id", "updated_at")
+                .first()
+            )
+        except (ValueError, TypeError):
+            marker = None
+        if marker is None:
+            return super().retrieve(request, *args, **kwargs)  # 404 as usual
+
+        etag = make_etag(request, kwargs["pk"], *marker)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        variant = f"{request.get_host()}?{request.query_params.urlencode()}"
+        key = representation_key(kwargs["pk"], *marker, variant)
+        data = cached_representation(key, lambda: self.get_serializer(self.get_object()).data)
+        return with_etag(Response(data), etag)
+
+    def get_queryset(self):
+        if self.action == "download":
+            # Streams one file: only the current version row is read
+            return Asset.objects.select_related("current_version")
+        queryset = super().get_queryset()
+        if self._wants_versions():
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "versions",
+                    queryset=AssetVersion.objects.select_related("uploaded_by", "category").prefetch_related(
+                        "tags", "renditions"
+                    ),
+                )
+            )
+        return queryset
+
+    @transaction.atomic
     def perform_create(self, serializer):
         """
         Handle both initial uploads and creation of new asset versions.
@@ -176,23 +318,16 @@ class AssetViewSet(viewsets.ModelViewSet):
                 version=new_version_num,
                 status="pending",  # Needs admin approval
             )
+            schedule_renditions(av)
             return av
 
         # Otherwise, it's a new asset (admins only — enforced by permission)
         asset = serializer.save(uploaded_by=request.user)
-        if tags:
-            if isinstance(tags, str):
-                tag_names = [t.strip() for t in tags.split(",") if t.strip()]
-            elif isinstance(tags, (list, tuple)):
-                tag_names = tags
-            else:
-                tag_names = []
-            for tname in tag_names:
-                tag_obj, _ = Tag.objects.get_or_create(name=tname)
-                asset.tags.add(tag_obj)
+        if isinstance(tags, (str, list, tuple)) and tags:
+            set_tags(asset, tags)
 
         # Create initial version entry automatically
-        AssetVersion.objects.create(
+        asset.current_version = AssetVersion.objects.create(
             asset=asset,
             file=asset.file,
             uploaded_by=request.user,
@@ -202,9 +337,144 @@ class AssetViewSet(viewsets.ModelViewSet):
             description=asset.description,
             category=asset.category
         )
+        asset.save(update_fields=["current_version"])
+        reindex_on_commit(asset.pk)
+        schedule_renditions(asset.current_version)
+        schedule_metadata_extraction(asset)
 
         return asset
 
+    def perform_update(self, serializer):
+        asset = serializer.save()
+        # Re-read with the prefetches for the response: DRF drops the stale
+        # prefetch cache after an update, which would load every version's
+        # tags, renditions and uploader one query at a time.
+        serializer.instance = self.get_queryset().get(pk=asset.pk)
+
+    # -------------------- Bulk ingest --------------------
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_ingest(self, request):
+        """
+        Upload many files in one request as approved assets.
+        Multipart fields:
+        - files: repeated, one per asset
+        - tags / category_id: defaults applied to every file
+        - manifest: optional JSON list of {"filename", "title", "description",
+          "tags", "category_id", "metadata"} overriding the defaults per file
+        """
+        files = request.FILES.getlist("files")
+        if not files:
+            return Response({"detail": "No files provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            manifest = json.loads(request.data.get("manifest") or "[]")
+            entries = {e.get("filename"): e for e in manifest if isinstance(e, dict)}
+            items = [
+                manifest_item(
+                    f,
+                    entries.get(f.name),
+                    tags=request.data.get("tags"),
+                    category_id=request.data.get("category_id"),
+                )
+                for f in files
+            ]
+        except (ValueError, TypeError, AttributeError):
+            return Response({"detail": "Invalid manifest or category_id"}, status=status.HTTP_400_BAD_REQUEST)
+
+        assets = ingest_assets(items, request.user)
+        return Response(
+            {"created": len(assets), "ids": [a.pk for a in assets]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    # -------------------- Download --------------------
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def download(self, request, pk=None):
+        """
+        Stream the current approved file, or a specific one with ?version=<n>.
+        Honours Range / If-Range and If-None-Match / If-Modified-Since;
+        ?attachment=1 asks the browser to save instead of display.
+        """
+        asset = self.get_object()
+        version = asset.current_version
+        requested = request.query_params.get("version")
+        if requested:
+            try:
+                version = asset.versions.filter(version=int(requested)).first()
+            except ValueError:
+                version = None
+            if version is None:
+                raise Http404("No such version")
+
+        fieldfile = version.file if version and version.file else asset.file
+        if not fieldfile:
+            raise Http404("Asset has no file")
+
+        number = version.version if version else asset.version
+        title = (version.title if version else None) or asset.title
+        filename = download_filename(title, number, fieldfile.name)
+        return serve_file(
+            request,
+            fieldfile,
+            etag=file_etag(fieldfile, number),
+            last_modified=version.uploaded_at if version else asset.uploaded_at,
+            filename=filename,
+            as_attachment=request.query_params.get("attachment") in ("1", "true"),
+        )
+
+    # -------------------- Export --------------------
+    def _selection_params(self):
+        """Query parameters that narrow the asset list: filters, ?search= and ?meta.*."""
+        names = {*self.filterset_class.base_filters, AssetSearchFilter.search_param}
+        return [
+            param for param, value in self.request.query_params.items()
+            if value and (param in names or param.startswith(META_PARAM))
+        ]
+
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        permission_classes=[permissions.IsAuthenticated],
+        parser_classes=[parsers.JSONParser, parsers.FormParser, parsers.MultiPartParser],
+    )
+    def export(self, request):
+        """
+        Stream a ZIP of the current approved files with a manifest.json of
+        their metadata. Select assets with ids (?ids=1,2,3 or "ids" in a
+        POST body) and/or the usual list filters and ?search=.
+        """
+        ids = request.data.get("ids") if request.method == "POST" else None
+        ids = ids or request.query_params.get("ids")
+        queryset = self.filter_queryset(
+            Asset.objects.select_related("uploaded_by", "category", "current_version__category")
+            .prefetch_related("tags", "current_version__tags")
+        )
+        if ids:
+            try:
+                ids = [int(i) for i in (ids.split(",") if isinstance(ids, str) else ids)]
+            except (TypeError, ValueError):
+                return Response({"detail": "ids must be a list of asset ids"}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(pk__in=ids)
+        elif not self._selection_params():
+            return Response({"detail": "Select assets with ids or filters"}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = getattr(settings, "ASSET_EXPORT_MAX_ASSETS", 1000)
+        assets = list(queryset[:limit + 1])
+        if not assets:
+            return Response({"detail": "No assets match"}, status=status.HTTP_404_NOT_FOUND)
+        if len(assets) > limit:
+            return Response(
+                {"detail": f"More than {limit} assets selected; narrow the selection"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        files, manifest = export_entries(assets)
+        response = StreamingHttpResponse(stream_zip(files, manifest), content_type="application/zip")
+        filename = f"assets-export-{timezone.localdate().isoformat()}.zip"
+        response["Content-Disposition"] = content_disposition_header(True, filename)
+        response["Cache-Control"] = "private, no-store"
+        return response
+
     # -------------------- Editor submits new version --------------------
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def request_update(self, request, pk=None):
@@ -227,42 +497,23 @@ class AssetViewSet(viewsets.ModelViewSet):
         title = request.data.get("title", asset.title)
         description = request.data.get("description", asset.description)
 
-        category_id = request.data.get("category")
-
         # allow category ID or name
-        category = None
-        if category_id:
-            try:
-                category_int = int(category_id)
-                category = Category.objects.filter(id=category_int).first()
-            except (ValueError, TypeError):
-                category = Category.objects.filter(name=category_id).first()
+        category = resolve_category(request.data.get("category"))
 
         tags_input = request.data.get("tags")  # comma separated
 
-        last_version = asset.version or 1
-        new_version = last_version + 1
-
         # -------------------- Create version with metadata --------------------
-        version = AssetVersion.objects.create(
-            asset=asset,
+        version = submit_version(
+            asset,
+            user,
             file=file or asset.file,
-            uploaded_by=user,
-            version=new_version,
-            status="pending",
             comment=comment,
             title=title,
             description=description,
             category=category,
+            tags=tags_input,
         )
 
-        # Set tags if provided
-        if tags_input:
-            tag_names = [t.strip() for t in tags_input.split(",") if t.strip()]
-            for tname in tag_names:
-                tag_obj, _ = Tag.objects.get_or_create(name=tname)
-                version.tags.add(tag_obj)
-
         serializer = AssetVersionSerializer(version, context={"request": request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -270,17 +521,112 @@ class AssetViewSet(viewsets.ModelViewSet):
 # ---------------------------------------------------------------------
 # ASSET VERSIONS (Admin can approve/reject)
 # ---------------------------------------------------------------------
-class AssetVersionViewSet(viewsets.ModelViewSet):
+class AssetVersionViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     serializer_class = AssetVersionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInCursorPagination
+    # Version saves and deletes touch their asset's updated_at
+    etag_updated_field = "asset__updated_at"
 
     def get_queryset(self):
-        queryset = AssetVersion.objects.select_related("uploaded_by", "asset", "category").prefetch_related("tags").all()
+        queryset = AssetVersion.objects.select_related("uploaded_by", "asset", "category").prefetch_related(
+            "tags", "renditions"
+        ).all()
         asset_id = self.request.query_params.get("asset_id")
         if asset_id:
             queryset = queryset.filter(asset_id=asset_id)
         return queryset.order_by("-version", "-uploaded_at")
 
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            marker = (
+                AssetVersion.objects.filter(pk=kwargs["pk"])
+                .values_list("status", "asset__updated_at")
+                .first()
+            )
+        except (ValueError, TypeError):
+            marker = None
+        if marker is None:
+            return super().retrieve(request, *args, **kwargs)  # 404 as usual
+
+        etag = make_etag(request, kwargs["pk"], *marker)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        return with_etag(super().retrieve(request, *args, **kwargs), etag)
+
+    # -------------------- Review queue --------------------
+    @action(detail=False, methods=["get"], url_path="review-queue")
+    def review_queue(self, request):
+        """
+        GET /api/versions/review-queue/?status=pending
+
+        One page of versions in the given status with their asset inlined,
+        plus the number of versions in every status from a single aggregate
+        query, so the admin screen needs no per-version asset requests.
+        """
+        if getattr(request.user, "role", "").lower() != "admin":
+            return Response({"detail": "Admins only"}, status=status.HTTP_403_FORBIDDEN)
+
+        statuses = [choice for choice, _ in AssetVersion.STATUS_CHOICES]
+        status_value = request.query_params.get("status", "pending")
+        if status_value not in statuses:
+            return Response({"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
+
+        counts = AssetVersion.objects.aggregate(
+            **{choice: Count("pk", filter=Q(status=choice)) for choice in statuses}
+        )
+        queryset = (
+            AssetVersion.objects.filter(status=status_value)
+            .select_related("asset", "uploaded_by", "category")
+            .prefetch_related("tags", "renditions")
+            .order_by("-uploaded_at", "-pk")
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            serializer = ReviewQueueSerializer(queryset, many=True, context=self.get_serializer_context())
+            return Response({"counts": counts, "results": serializer.data})
+        serializer = ReviewQueueSerializer(page, many=True, context=self.get_serializer_context())
+        response = self.get_paginated_response(serializer.data)
+        response.data["counts"] = counts
+        return response
+
+    # -------------------- Bulk review --------------------
+    @action(detail=False, methods=["post"], url_path="bulk-review")
+    def bulk_review(self, request):
+        """
+        POST /api/versions/bulk-review/ {"ids": [1, 2, ...], "status": "approved"}
+
+        Approves or rejects all listed versions in one transaction and
+        reports a result per id (see assets.review.review_versions).
+        """
+        if getattr(request.user, "role", "").lower() != "admin":
+            return Response({"detail": "Admins only"}, status=status.HTTP_403_FORBIDDEN)
+
+        status_value = request.data.get("status")
+        if status_value not in ("approved", "rejected"):
+            return Response({"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = request.data.get("ids")
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({"detail": "ids must be a list of version ids"}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids:
+            return Response({"detail": "ids must be a list of version ids"}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = review_versions(ids, status_value)
+        updated = sum(1 for result in results if result["status"] is not None)
+        return Response({"status": status_value, "updated": updated, "results": results})
+
+    def perform_destroy(self, instance):
+        asset = instance.asset
+        was_current = asset.current_version_id == instance.pk
+        instance.delete()
+        if was_current:
+            asset.sync_current_version()
+
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
         user = request.user
@@ -293,32 +639,57 @@ class AssetVersionViewSet(viewsets.ModelViewSet):
         if status_value not in ("approved", "rejected"):
             return Response({"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Same locked, single-transaction path as bulk-review
+        review_versions([instance.pk], status_value)
         instance.status = status_value
-        instance.save()
-
-        # -------------------- APPROVAL LOGIC --------------------
-        if status_value == "approved":
-            asset = instance.asset
-
-            # Update metadata fields
-            asset.title = instance.title or asset.title
-            asset.description = instance.description or asset.description
-            asset.category = instance.category or asset.category
-
-            if instance.tags.exists():
-                asset.tags.set(instance.tags.all())
-
-            # Do not overwrite file directly with same FileField instance
-            if instance.file and instance.file.name != (asset.file.name if asset.file else ""):
-                # Keep old file intact — only point to the new version’s copy
-                asset.file.save(
-                    instance.file.name.split("/")[-1],  # filename only
-                    instance.file.file,  # file object
-                    save=False  # prevent immediate save to avoid double delete
-                )
-
-            asset.version = instance.version
-            asset.save()
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+
+
+# ---------------------------------------------------------------------
+# CHUNKED / RESUMABLE UPLOADS
+# ---------------------------------------------------------------------
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    1. POST   /api/uploads/                      {filename, size, [part_size], [sha256], [asset], [fields]}
+    2. PUT    /api/uploads/<id>/parts/<n>/       raw bytes, optional X-Part-SHA256 header
+       (parts may be sent in parallel; GET /api/uploads/<id>/ lists the
+       received ones so an interrupted upload can resume)
+    3. POST   /api/uploads/<id>/complete/        creates the Asset, or a pending
+       AssetVersion when "asset" was given
+    DELETE /api/uploads/<id>/ aborts and discards the staged bytes.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user).prefetch_related("parts")
+
+    def perform_create(self, serializer):
+        if getattr(self.request.user, "role", "").lower() not in ("admin", "editor"):
+            raise PermissionDenied("Only admins and editors can upload")
+        session = serializer.save(user=self.request.user)
+        start_upload(session)
+
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+        instance.delete()
+
+    @action(detail=True, methods=["put"], url_path=r"parts/(?P<number>\d+)", parser_classes=[])
+    def upload_part(self, request, pk=None, number=None):
+        session = self.get_object()
+        part = write_part(session, int(number), request, request.headers.get("X-Part-SHA256"))
+        return Response({"number": part.number, "size": part.size, "sha256": part.sha256})
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        result = complete_upload(self.get_object())
+        if isinstance(result, AssetVersion):
+            data = AssetVersionSerializer(result, context={"request": request}).data
+        else:
+            data = AssetSerializer(result, context={"request": request}).data
+        return Response(data, status=status.HTTP_201_CREATED)
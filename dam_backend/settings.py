@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "assets.metrics.RequestMetricsMiddleware",  # first, so it times everything below
     "corsheaders.middleware.CorsMiddleware",  # allow cross-origin requests
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -108,7 +109,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "assets.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -131,3 +132,61 @@ AUTH_USER_MODEL = "assets.User"
 REST_FRAMEWORK["DEFAULT_PAGINATION_CLASS"] = "rest_framework.pagination.PageNumberPagination"
 REST_FRAMEWORK["PAGE_SIZE"] = 12
 
+
+# Asset downloads: None streams from Django, "x-accel-redirect" (nginx) or
+# "x-sendfile" (Apache/lighttpd) hand the file body to the web server.
+ASSET_DOWNLOAD_OFFLOAD = None
+ASSET_DOWNLOAD_ACCEL_PREFIX = "/protected-media/"
+
+# ZIP exports (/api/assets/export/) stream any archive size in constant
+# memory; this only caps how many assets one export may select.
+ASSET_EXPORT_MAX_ASSETS = 1000
+
+# Background tasks (renditions, metadata...) are stored in the assets_task
+# table and run by `python manage.py run_task_worker`. Set TASK_ALWAYS_EAGER
+# to run them in-process after commit instead (no worker needed).
+TASK_ALWAYS_EAGER = False
+TASK_WORKER_PROCESSES = 2
+TASK_TIMEOUT = 300  # seconds a task may run before the worker stops it
+TASK_LOCK_TIMEOUT = 600  # seconds before a running task is considered abandoned
+
+# Chunked uploads (/api/uploads/): default part size and allowed range
+CHUNKED_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+CHUNKED_UPLOAD_MIN_PART_SIZE = 256 * 1024
+CHUNKED_UPLOAD_MAX_PART_SIZE = 64 * 1024 * 1024
+
+# /api/stats/ dashboard aggregates: cached in the default cache, dropped on
+# asset/version/category/tag writes, recomputed at the latest after this.
+STATS_CACHE_TIMEOUT = 300
+STATS_TOP_TAGS = 50
+
+# Serialized asset representations (assets.caching) live in their own cache
+# so they can move to Redis/Memcached without touching the default cache.
+# Keys and list/detail ETags follow each asset's updated_at, which asset
+# edits and tag/category/user renames move, so they reach every process.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "assets": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "asset-representations",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+ASSET_CACHE_ALIAS = "assets"
+ASSET_CACHE_TIMEOUT = 300
+
+# API requests authenticate from the JWT claims (assets.authentication);
+# role and active flags are re-read from the database at most this often
+# per user and process, which bounds how long a role change or
+# deactivation takes to apply to already-issued access tokens.
+AUTH_USER_CACHE_TIMEOUT = 30
+
+# Per-route request metrics (assets.metrics), scraped from /metrics/ with
+# "Authorization: Bearer <METRICS_TOKEN>" (the endpoint is closed while it
+# is None). Set METRICS_SLOW_REQUEST_MS to log requests slower than that,
+# with their slowest and repeated SQL, to the "assets.metrics" logger.
+METRICS_ENABLED = True
+METRICS_TOKEN = None
+METRICS_SLOW_REQUEST_MS = None
@@ -4,7 +4,8 @@ from django.urls import path, include
 from rest_framework import routers
 from assets.views import (
     UserViewSet, AssetViewSet, CategoryViewSet,
-    TagViewSet, AssetVersionViewSet, MyTokenObtainPairView, me_view
+    TagViewSet, AssetVersionViewSet, UploadSessionViewSet, MyTokenObtainPairView, me_view, stats_view,
+    cache_stats_view, metrics_view,
 )
 from rest_framework_simplejwt.views import TokenRefreshView
 from django.conf import settings
@@ -16,6 +17,7 @@ router.register(r"assets", AssetViewSet, basename="assets")
 router.register(r"categories", CategoryViewSet)
 router.register(r"tags", TagViewSet)
 router.register(r"versions", AssetVersionViewSet, basename="versions")
+router.register(r"uploads", UploadSessionViewSet, basename="uploads")
 
 def home(request):
     return JsonResponse({"message": "Welcome to the DAM backend API!"})
@@ -24,6 +26,9 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(router.urls)),
     path("api/me/", me_view, name="me"),  # ✅ added route
+    path("api/stats/", stats_view, name="stats"),
+    path("api/stats/cache/", cache_stats_view, name="cache-stats"),
+    path("metrics/", metrics_view, name="metrics"),
     path("api/token/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("", home),
@@ -69,6 +69,10 @@ export default function AssetCard({ asset: initialAsset, assetId }) {
 
   const fileUrl = asset.file?.startsWith("http") ? asset.file : `${base}${asset.file}`;
   const kind = detectKind(asset.file || "");
+  // Server-generated renditions (may not exist yet right after upload)
+  const toUrl = (path) => (path?.startsWith("http") ? path : `${base}${path}`);
+  const thumbUrl = asset.renditions?.thumbnail ? toUrl(asset.renditions.thumbnail) : `${fileUrl}?cb=${cacheBust}`;
+  const posterUrl = asset.renditions?.poster ? toUrl(asset.renditions.poster) : undefined;
 
   return (
     <Box p={4} borderWidth="1px" borderRadius="md" shadow="sm" bg="white" _hover={{ shadow: "md" }}>
@@ -77,10 +81,10 @@ export default function AssetCard({ asset: initialAsset, assetId }) {
       <Divider my={3} />
 
       {kind === "image" && (
-        <Image src={`${fileUrl}?cb=${cacheBust}`} alt={asset.title} mb={3} maxH="200px" objectFit="cover" borderRadius="md" />
+        <Image src={thumbUrl} alt={asset.title} mb={3} maxH="200px" objectFit="cover" borderRadius="md" />
       )}
       {kind === "video" && (
-        <video key={fileUrl + cacheBust} src={`${fileUrl}?cb=${cacheBust}`} controls style={{ width: "100%", borderRadius: 12, marginBottom: 12 }} />
+        <video key={fileUrl + cacheBust} src={`${fileUrl}?cb=${cacheBust}`} poster={posterUrl} preload="metadata" controls style={{ width: "100%", borderRadius: 12, marginBottom: 12 }} />
       )}
       {kind === "pdf" && (
         <embed key={fileUrl + cacheBust} src={`${fileUrl}?cb=${cacheBust}`} type="application/pdf" width="100%" height="200px" style={{ borderRadius: 12, marginBottom: 12 }} />
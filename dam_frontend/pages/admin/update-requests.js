@@ -30,6 +30,7 @@ export default function UpdateRequests() {
   const [previewVersion, setPreviewVersion] = useState(null);
   const [isOpen, setIsOpen] = useState(false);
   const [activeFilter, setActiveFilter] = useState("pending");
+  const [counts, setCounts] = useState({});
   const toast = useToast();
   const router = useRouter();
 
@@ -59,34 +60,16 @@ export default function UpdateRequests() {
     }
   }, []);
 
-  async function fetchRequests(t) {
+  async function fetchRequests(t, status = activeFilter) {
     try {
-      const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/versions/`, {
+      // One request: the page of versions in this status with their asset
+      // inlined, plus server-side counts for every status.
+      const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/versions/review-queue/?status=${status}`, {
         headers: { Authorization: `Bearer ${t}` },
       });
       const data = await res.json();
-      const versionList = Array.isArray(data.results) ? data.results : Array.isArray(data) ? data : [];
-
-      // Fetch full asset info for each version if missing
-      const versionsWithAssets = await Promise.all(
-        versionList.map(async (v) => {
-          if (!v.asset && v.asset_id) {
-            try {
-              const resAsset = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/assets/${v.asset_id}/`, {
-                headers: { Authorization: `Bearer ${t}` },
-              });
-              const assetData = await resAsset.json();
-              return { ...v, asset: assetData };
-            } catch (err) {
-              console.error("Failed to fetch asset", err);
-              return v;
-            }
-          }
-          return v;
-        })
-      );
-
-      setRequests(versionsWithAssets);
+      setRequests(Array.isArray(data.results) ? data.results : []);
+      setCounts(data.counts || {});
     } catch (err) {
       console.error(err);
       toast({ title: "Failed to fetch update requests", status: "error" });
@@ -96,6 +79,11 @@ export default function UpdateRequests() {
     }
   }
 
+  function selectFilter(status) {
+    setActiveFilter(status);
+    fetchRequests(token, status);
+  }
+
   async function handleApproval(id, approve = true) {
     try {
       const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/versions/${id}/`, {
@@ -134,17 +122,6 @@ export default function UpdateRequests() {
 
   if (loading) return <Spinner size="xl" />;
 
-  // Group requests by status
-  const groupedRequests = requests.reduce(
-    (acc, req) => {
-      const status = req.status || "pending";
-      if (!acc[status]) acc[status] = [];
-      acc[status].push(req);
-      return acc;
-    },
-    { pending: [], approved: [], rejected: [] }
-  );
-
   const renderRequestCard = (req) => (
     <Box key={req.id} p={5} borderWidth="1px" borderRadius="xl" shadow="sm" bg="white">
       <HStack justify="space-between" mb={2}>
@@ -196,24 +173,20 @@ export default function UpdateRequests() {
               size="sm"
               colorScheme={activeFilter === status ? "blue" : "gray"}
               variant={activeFilter === status ? "solid" : "outline"}
-              onClick={() => setActiveFilter(status)}
+              onClick={() => selectFilter(status)}
             >
-              {status.charAt(0).toUpperCase() + status.slice(1)}
+              {status.charAt(0).toUpperCase() + status.slice(1)} ({counts[status] ?? 0})
             </Button>
           ))}
         </HStack>
 
         {requests.length === 0 ? (
           <Box textAlign="center" py={10}>
-            <Text color="gray.500" fontSize="lg">No update requests at the moment.</Text>
+            <Text color="gray.500" fontSize="lg">No {activeFilter} requests.</Text>
           </Box>
         ) : (
           <VStack align="stretch" spacing={5}>
-            {groupedRequests[activeFilter].length > 0 ? (
-              groupedRequests[activeFilter].map(renderRequestCard)
-            ) : (
-              <Text color="gray.500">No {activeFilter} requests.</Text>
-            )}
+            {requests.map(renderRequestCard)}
           </VStack>
         )}
 
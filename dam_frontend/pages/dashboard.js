@@ -31,14 +31,26 @@ export default function Dashboard() {
       return;
     }
 
-    // Fetch counts
+    // Counts come from the cached server-side aggregates
+    fetch(`${process.env.NEXT_PUBLIC_API_URL}/stats/`, {
+      headers: { Authorization: `Bearer ${token}` },
+    })
+      .then((r) => r.json())
+      .then((d) =>
+        setCounts({
+          assets: d.totals?.assets || 0,
+          categories: d.totals?.categories || 0,
+          tags: d.totals?.tags || 0,
+        })
+      )
+      .catch(() => {});
+
+    // Recent uploads: first page of the gallery list
     fetch(`${process.env.NEXT_PUBLIC_API_URL}/assets/`, {
       headers: { Authorization: `Bearer ${token}` },
     })
       .then((r) => r.json())
       .then((data) => {
-        const assetCount = data.count || (Array.isArray(data) ? data.length : 0);
-        setCounts((prev) => ({ ...prev, assets: assetCount }));
         setRecent(
           Array.isArray(data.results)
             ? data.results.slice(0, 6)
@@ -48,30 +60,6 @@ export default function Dashboard() {
         );
       })
       .catch(console.error);
-
-    fetch(`${process.env.NEXT_PUBLIC_API_URL}/categories/`, {
-      headers: { Authorization: `Bearer ${token}` },
-    })
-      .then((r) => r.json())
-      .then((d) =>
-        setCounts((prev) => ({
-          ...prev,
-          categories: Array.isArray(d) ? d.length : 0,
-        }))
-      )
-      .catch(() => {});
-
-    fetch(`${process.env.NEXT_PUBLIC_API_URL}/tags/`, {
-      headers: { Authorization: `Bearer ${token}` },
-    })
-      .then((r) => r.json())
-      .then((d) =>
-        setCounts((prev) => ({
-          ...prev,
-          tags: Array.isArray(d) ? d.length : 0,
-        }))
-      )
-      .catch(() => {});
   }, []);
 
   const lowerRole = role ? role.toLowerCase() : "";